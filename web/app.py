@@ -13,16 +13,20 @@ AI 智能分镜 Pro v2.1 - 专业分镜制作系统
 """
 
 import os
+import re
+import asyncio
 import json
 import shutil
 import time
+import functools
 import gradio as gr
 from pathlib import Path
-from typing import List, Optional, Tuple, Dict, Any
+from typing import List, Optional, Tuple, Dict, Any, Iterator
 from datetime import datetime
 import uuid
 import zipfile
 import base64
+import hashlib
 from io import BytesIO
 
 from models import (
@@ -51,6 +55,7 @@ PROJECTS_DIR = settings.projects_dir
 OUTPUTS_DIR = settings.outputs_dir
 EXPORTS_DIR = settings.exports_dir
 EXAMPLES_DIR = settings.examples_dir
+STATIC_DIR = BASE_DIR / "static"
 
 # 确保目录存在
 settings.ensure_directories()
@@ -134,13 +139,16 @@ def manual_load_project():
         return f"❌ 加载失败: {e}", get_video_cards_html(), get_video_stats_html()
 
 
-def get_video_for_preview(shot_num: int) -> str:
-    """获取指定镜头的视频路径用于预览"""
+def get_video_for_preview(shot_num: str) -> str:
+    """获取指定镜头的视频路径用于预览（镜头号由前端写入隐藏文本框）"""
     global current_project
     if current_project is None:
         return None
 
-    shot_num = int(shot_num)
+    try:
+        shot_num = int(str(shot_num).strip())
+    except ValueError:
+        return None
     if shot_num < 1 or shot_num > len(current_project.shots):
         return None
 
@@ -584,193 +592,81 @@ EXAMPLE_STORIES = {
     }
 }
 
+# 镜头类型 -> 镜头模板（界面选项即其键的顺序）
+SHOT_TEMPLATE_MAP = {
+    "全景": ShotTemplate.T1_ESTABLISHING_WIDE,
+    "中景": ShotTemplate.T4_STANDARD_MEDIUM,
+    "特写": ShotTemplate.T6_CLOSEUP,
+    "过肩": ShotTemplate.T5_OVER_SHOULDER,
+    "低角度": ShotTemplate.T7_LOW_ANGLE,
+    "跟随": ShotTemplate.T8_FOLLOWING,
+}
+
 
 # ========================================
 # 专业CSS样式
 # ========================================
-CUSTOM_CSS = """
-:root {
-    --pure-white: #ffffff;
-    --soft-white: #fafafa;
-    --light-gray: #f5f5f7;
-    --medium-gray: #d2d2d7;
-    --dark-gray: #86868b;
-    --near-black: #1d1d1f;
-    --apple-blue: #0071e3;
-    --apple-blue-hover: #0077ed;
-    --success-green: #34c759;
-    --warning-orange: #ff9500;
-    --error-red: #ff3b30;
-}
-
-* { box-sizing: border-box; }
-
-.gradio-container {
-    background: var(--soft-white) !important;
-    font-family: -apple-system, BlinkMacSystemFont, 'SF Pro Display', 'Noto Sans SC', sans-serif !important;
-    color: var(--near-black) !important;
-    max-width: 1400px !important;
-    margin: 0 auto !important;
-    padding: 0 24px !important;
-}
-
-.app-title {
-    text-align: center;
-    padding: 40px 0 30px 0;
-    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-    -webkit-background-clip: text;
-    -webkit-text-fill-color: transparent;
-    background-clip: text;
-}
-
-.app-title h1 {
-    font-size: 42px !important;
-    font-weight: 700 !important;
-    margin: 0 0 8px 0 !important;
-}
-
-.app-title p {
-    font-size: 18px !important;
-    color: var(--dark-gray) !important;
-    -webkit-text-fill-color: var(--dark-gray);
-}
-
-input[type="text"], textarea {
-    background: #111a22 !important;
-    border: 1px solid #233648 !important;
-    border-radius: 8px !important;
-    padding: 12px 14px !important;
-    font-size: 15px !important;
-    color: #e2e8f0 !important;
-}
-
-input[type="text"]::placeholder, textarea::placeholder {
-    color: #6b8299 !important;
-    opacity: 1 !important;
-}
-
-input[type="text"]:focus, textarea:focus {
-    background: #16202a !important;
-    border-color: #137fec !important;
-    box-shadow: 0 0 0 2px rgba(19, 127, 236, 0.2) !important;
-    outline: none !important;
-}
-
-/* 隐藏 Gradio 默认的 "单选框" 和 "Textbox" 标签 */
-.gradio-container span.sr-only,
-label.block span:only-child:empty + span,
-.wrap span[data-testid="block-label"]:empty {
-    display: none !important;
-}
-
-/* 隐藏无用的标签文字 */
-.block > span:first-child:not([class]) {
-    display: none !important;
-}
-
-.primary-btn {
-    background: var(--apple-blue) !important;
-    color: white !important;
-    border: none !important;
-    border-radius: 10px !important;
-    padding: 12px 24px !important;
-    font-size: 15px !important;
-    font-weight: 500 !important;
-    cursor: pointer !important;
-    transition: all 0.2s !important;
-}
-
-.primary-btn:hover {
-    background: var(--apple-blue-hover) !important;
-    transform: translateY(-1px) !important;
-}
-
-.secondary-btn {
-    background: transparent !important;
-    color: var(--apple-blue) !important;
-    border: 1px solid var(--apple-blue) !important;
-    border-radius: 10px !important;
-    padding: 12px 24px !important;
-    font-size: 15px !important;
-}
-
-.secondary-btn:hover {
-    background: rgba(0, 113, 227, 0.1) !important;
-}
-
-.success-btn {
-    background: var(--success-green) !important;
-    color: white !important;
-    border: none !important;
-    border-radius: 10px !important;
-    padding: 12px 24px !important;
-    font-size: 15px !important;
-}
-
-.warning-btn {
-    background: var(--warning-orange) !important;
-    color: white !important;
-    border: none !important;
-    border-radius: 10px !important;
-}
-
-.example-card {
-    background: white;
-    border-radius: 12px;
-    padding: 16px;
-    margin: 8px 0;
-    box-shadow: 0 2px 8px rgba(0,0,0,0.08);
-    cursor: pointer;
-    transition: all 0.2s;
-}
-
-.example-card:hover {
-    box-shadow: 0 4px 16px rgba(0,0,0,0.12);
-    transform: translateY(-2px);
-}
-
-.stats-panel {
-    display: flex;
-    justify-content: center;
-    gap: 40px;
-    padding: 20px;
-    background: white;
-    border-radius: 12px;
-    margin: 16px 0;
-}
-
-.stat-item {
-    text-align: center;
-}
-
-.stat-value {
-    font-size: 28px;
-    font-weight: 600;
-    color: var(--near-black);
-}
-
-.stat-label {
-    font-size: 12px;
-    color: var(--dark-gray);
-    margin-top: 4px;
-}
+# 界面样式表：base.css（按钮、卡片等通用样式）和 app.css 为首屏关键样式，
+# 合并成一个 <style> 内联；deferred.css 为弹窗等非首屏样式（异步加载）
+BASE_CSS_FILE = STATIC_DIR / "base.css"
+APP_CSS_FILE = STATIC_DIR / "app.css"
+DEFERRED_CSS_FILE = STATIC_DIR / "deferred.css"
+
+
+_CSS_STRING_RE = re.compile(r'("(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\')')
+_CSS_COMMENT_RE = re.compile(r'("(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\')|/\*.*?\*/', re.S)
+
+
+def minify_css(css: str) -> str:
+    """压缩 CSS：去掉注释、换行和多余空白（引号内的字符串原样保留）"""
+    css = _CSS_COMMENT_RE.sub(lambda m: m.group(1) or '', css)
+    parts = _CSS_STRING_RE.split(css)
+    for i in range(0, len(parts), 2):
+        token = re.sub(r'\s+', ' ', parts[i])
+        token = re.sub(r'\s*([{};,>])\s*', r'\1', token)
+        parts[i] = re.sub(r':\s+', ':', token)
+    return ''.join(parts).replace(';}', '}').strip()
+
+
+def build_min_css(css_file: Path) -> Path:
+    """生成压缩后的 *.min.css（源文件未变化时直接复用）"""
+    min_file = css_file.with_suffix(".min.css")
+    if min_file.exists() and min_file.stat().st_mtime >= css_file.stat().st_mtime:
+        return min_file
+    minified = minify_css(css_file.read_text(encoding='utf-8'))
+    min_file.write_text(minified, encoding='utf-8')
+    print(f"[样式] 已压缩 {css_file.name}: {css_file.stat().st_size} -> {len(minified.encode('utf-8'))} 字节")
+    return min_file
+
+
+def get_app_css_head() -> str:
+    """生成 <head> 样式：关键样式合并为一个内联 <style>，其余样式带内容哈希异步加载"""
+    head_parts = []
+
+    critical_parts = []
+    for css_file in (BASE_CSS_FILE, APP_CSS_FILE):
+        if css_file.exists():
+            critical_parts.append(build_min_css(css_file).read_text(encoding='utf-8'))
+        else:
+            print(f"[样式] 未找到样式文件: {css_file}")
+    if critical_parts:
+        head_parts.append(f'<style id="director-ai-static">{"".join(critical_parts)}</style>')
+
+    if DEFERRED_CSS_FILE.exists():
+        css_file = build_min_css(DEFERRED_CSS_FILE)
+        digest = hashlib.md5(css_file.read_bytes()).hexdigest()[:10]
+        css_url = "/gradio_api/file=" + str(css_file).replace("\\", "/") + f"?v={digest}"
+        head_parts.append(
+            f'<link rel="preload" href="{css_url}" as="style" onload="this.onload=null;this.rel=\'stylesheet\'">'
+        )
+    else:
+        print(f"[样式] 未找到样式文件: {DEFERRED_CSS_FILE}")
 
-footer { display: none !important; }
+    return "\n".join(head_parts)
 
-.gradio-container label:empty { display: none !important; }
 
-/* 隐藏触发器行 (保持在DOM中以供JavaScript访问) */
-.hidden-trigger-row {
-    position: absolute !important;
-    left: -9999px !important;
-    height: 0 !important;
-    overflow: hidden !important;
-    pointer-events: none !important;
-}
-.hidden-trigger-row * {
-    pointer-events: auto !important;
-}
-"""
+# 样式在导入时只构建一次，热重载/重复创建界面时直接复用
+APP_CSS_HEAD = get_app_css_head()
 
 
 # ========================================
@@ -816,6 +712,74 @@ def save_multiple_images(images: List, category: str, name: str) -> List[str]:
     return paths
 
 
+# 预览缩略图：按宽度生成 WebP，供卡片和弹窗的 srcset 使用
+# 缓存目录以 . 开头，不会与项目输出目录重名
+THUMB_DIR = OUTPUTS_DIR / ".thumbs"
+THUMB_WIDTHS = (256, 640, 1280)
+
+
+def get_image_thumbnail(image_path: str, width: int) -> Optional[Path]:
+    """生成指定宽度的 WebP 缩略图（原图未变化时直接复用缓存，原图更新后清理旧版本）"""
+    try:
+        stat = os.stat(image_path)
+        path_key = hashlib.md5(image_path.encode('utf-8')).hexdigest()[:16]
+        version_prefix = f"{path_key}_{stat.st_mtime_ns}_"
+        thumb_path = THUMB_DIR / f"{version_prefix}{width}.webp"
+        if thumb_path.exists():
+            return thumb_path
+
+        from PIL import Image
+        THUMB_DIR.mkdir(parents=True, exist_ok=True)
+        # 同一原图的旧版本缩略图（修改时间不同）已失效，生成新版本前删除
+        for stale in THUMB_DIR.glob(f"{path_key}_*.webp"):
+            if not stale.name.startswith(version_prefix):
+                stale.unlink(missing_ok=True)
+        with Image.open(image_path) as img:
+            if img.width > width:
+                img = img.resize((width, max(1, round(width * img.height / img.width))), Image.LANCZOS)
+            if img.mode not in ("RGB", "RGBA"):
+                img = img.convert("RGBA" if "transparency" in img.info else "RGB")
+            img.save(thumb_path, "WEBP", quality=82)
+        return thumb_path
+    except Exception as e:
+        print(f"[缩略图] 生成失败 {image_path}: {e}")
+        return None
+
+
+@functools.lru_cache(maxsize=512)
+def _read_image_size(image_path: str, mtime_ns: int) -> Optional[Tuple[int, int]]:
+    """读取图片尺寸（只解析文件头，按修改时间缓存）"""
+    try:
+        from PIL import Image
+        with Image.open(image_path) as img:
+            return img.size
+    except Exception:
+        return None
+
+
+def get_thumbnail_size_attrs(image_path: str, width: int = THUMB_WIDTHS[0]) -> str:
+    """缩略图 <img> 的 width/height 属性，让浏览器在图片到达前就知道其尺寸"""
+    try:
+        size = _read_image_size(image_path, os.stat(image_path).st_mtime_ns)
+    except OSError:
+        size = None
+    if not size or not size[0]:
+        return ""
+    thumb_width = min(width, size[0])
+    return f'width="{thumb_width}" height="{max(1, round(thumb_width * size[1] / size[0]))}"'
+
+
+def get_image_thumbnail_urls(image_path: str) -> Dict[int, str]:
+    """获取各宽度缩略图的访问地址 {宽度: URL}，任一尺寸失败时返回空字典"""
+    urls = {}
+    for width in THUMB_WIDTHS:
+        thumb_path = get_image_thumbnail(image_path, width)
+        if thumb_path is None:
+            return {}
+        urls[width] = "/gradio_api/file=" + str(thumb_path).replace("\\", "/")
+    return urls
+
+
 # ========================================
 # 核心功能函数
 # ========================================
@@ -849,7 +813,7 @@ def generate_story_from_idea(story_idea: str):
         gr.update(choices=[]), gr.update(choices=[]),
         gr.update(choices=[]), gr.update(choices=[]),
         "电影感", "", "",
-        get_workflow_indicator(0),
+        0,  # workflow_step_indicator
         "", "", "",
         '<div class="no-shots">暂无镜头</div>'
     )
@@ -869,7 +833,7 @@ def generate_story_from_idea(story_idea: str):
                 gr.update(choices=[]), gr.update(choices=[]),
                 gr.update(choices=[]), gr.update(choices=[]),
                 "电影感", "", "",
-                get_workflow_indicator(0),
+                0,  # workflow_step_indicator
                 "", "", "",
                 '<div class="no-shots">暂无镜头</div>'
             )
@@ -905,20 +869,12 @@ def generate_story_from_idea(story_idea: str):
 
         # 添加镜头 - 优先使用AI生成的镜头数据
         ai_shots = result.get("shots", [])
-        template_map = {
-            "全景": ShotTemplate.T1_ESTABLISHING_WIDE,
-            "中景": ShotTemplate.T4_STANDARD_MEDIUM,
-            "特写": ShotTemplate.T6_CLOSEUP,
-            "过肩": ShotTemplate.T5_OVER_SHOULDER,
-            "低角度": ShotTemplate.T7_LOW_ANGLE,
-            "跟随": ShotTemplate.T8_FOLLOWING,
-        }
 
         if ai_shots:
             # 使用AI生成的镜头数据
             for i, shot_data in enumerate(ai_shots):
                 template_name = shot_data.get("template", "中景")
-                template_type = template_map.get(template_name, ShotTemplate.T4_STANDARD_MEDIUM)
+                template_type = SHOT_TEMPLATE_MAP.get(template_name, ShotTemplate.T4_STANDARD_MEDIUM)
                 template_def = get_template(template_type)
 
                 # 查找角色ID
@@ -1016,7 +972,7 @@ def generate_story_from_idea(story_idea: str):
             style_name,
             first_standard_prompt,
             first_generated_prompt,
-            get_workflow_indicator(3),
+            3,  # workflow_step_indicator
             get_step_summary(2),
             get_step_summary(3),
             get_step_summary(4),
@@ -1031,7 +987,7 @@ def generate_story_from_idea(story_idea: str):
             gr.update(choices=[]), gr.update(choices=[]),
             gr.update(choices=[]), gr.update(choices=[]),
             "电影感", "", "",
-            get_workflow_indicator(0),
+            0,  # workflow_step_indicator
             "", "", "",
             '<div class="no-shots">暂无镜头</div>'
         )
@@ -1047,7 +1003,7 @@ def load_example_story(story_name: str):
             gr.update(choices=[]), gr.update(choices=[]),
             gr.update(choices=[]), gr.update(choices=[]),
             "2D卡通", "", "",
-            get_workflow_indicator(0),
+            0,  # workflow_step_indicator
             "", "", "",  # step summaries
             '<div class="no-shots">暂无镜头</div>'  # shot_cards_html
         )
@@ -1107,7 +1063,7 @@ def load_example_story(story_name: str):
                     gr.update(choices=char_names), gr.update(choices=scene_names),
                     gr.update(choices=char_names), gr.update(choices=scene_names),
                     example["style"], first_standard_prompt, first_generated_prompt,
-                    get_workflow_indicator(2 if valid_images > 0 else 1),
+                    2 if valid_images > 0 else 1,  # workflow_step_indicator
                     get_step_summary(2),
                     get_step_summary(3),
                     get_step_summary(4),
@@ -1145,16 +1101,7 @@ def load_example_story(story_name: str):
 
     # 添加镜头
     for shot_data in example["shots"]:
-        template_map = {
-            "全景": ShotTemplate.T1_ESTABLISHING_WIDE,
-            "中景": ShotTemplate.T4_STANDARD_MEDIUM,
-            "特写": ShotTemplate.T6_CLOSEUP,
-            "过肩": ShotTemplate.T5_OVER_SHOULDER,
-            "低角度": ShotTemplate.T7_LOW_ANGLE,
-            "跟随": ShotTemplate.T8_FOLLOWING,
-        }
-
-        template_type = template_map.get(shot_data["template"], ShotTemplate.T4_STANDARD_MEDIUM)
+        template_type = SHOT_TEMPLATE_MAP.get(shot_data["template"], ShotTemplate.T4_STANDARD_MEDIUM)
         template_def = get_template(template_type)
 
         # 查找角色ID
@@ -1220,7 +1167,7 @@ def load_example_story(story_name: str):
         example["style"],  # style_choice
         first_standard_prompt,  # standard_prompt
         first_generated_prompt,  # generated_prompt
-        get_workflow_indicator(3),  # workflow_step_indicator - 跳到第3步生成
+        3,  # workflow_step_indicator - 跳到第3步生成
         get_step_summary(2),  # step2_summary
         get_step_summary(3),  # step3_summary
         get_step_summary(4),  # step4_summary
@@ -1344,12 +1291,17 @@ style_locked = True
 locked_style_name = "2D卡通"
 
 
+# 风格类型 -> 详细风格选项（第一项为默认值）
+STYLE_OPTIONS = {
+    "2D": ["2D卡通", "动漫风", "漫画风", "水彩画"],
+    "3D": ["3D写实", "电影感", "游戏CG", "赛博朋克"],
+}
+
+
 def get_style_options(category: str):
     """根据风格类型获取详细选项"""
-    if category == "2D":
-        return gr.update(choices=["2D卡通", "动漫风", "漫画风", "水彩画"], value="2D卡通")
-    else:  # 3D
-        return gr.update(choices=["3D写实", "电影感", "游戏CG", "赛博朋克"], value="3D写实")
+    options = STYLE_OPTIONS.get(category, STYLE_OPTIONS["3D"])
+    return gr.update(choices=options, value=options[0])
 
 
 def toggle_style_lock(locked: bool):
@@ -1409,16 +1361,7 @@ def add_shot_simple(
     if current_project is None:
         return "请先创建项目", [], "", ""
 
-    template_map = {
-        "全景": ShotTemplate.T1_ESTABLISHING_WIDE,
-        "中景": ShotTemplate.T4_STANDARD_MEDIUM,
-        "特写": ShotTemplate.T6_CLOSEUP,
-        "过肩": ShotTemplate.T5_OVER_SHOULDER,
-        "低角度": ShotTemplate.T7_LOW_ANGLE,
-        "跟随": ShotTemplate.T8_FOLLOWING,
-    }
-
-    template_type = template_map.get(template_name, ShotTemplate.T4_STANDARD_MEDIUM)
+    template_type = SHOT_TEMPLATE_MAP.get(template_name, ShotTemplate.T4_STANDARD_MEDIUM)
     template_def = get_template(template_type)
 
     char_ids = []
@@ -1579,8 +1522,8 @@ def regenerate_all_prompts() -> str:
     return f"✓ 已重新生成 {count} 个镜头的提示词"
 
 
-def apply_seed_settings(lock_seed: bool, seed_value: int) -> str:
-    """应用种子锁定设置"""
+async def apply_seed_settings(lock_seed: bool, seed_value: int) -> str:
+    """应用种子锁定设置（只改内存中的项目状态，直接在事件循环上执行）"""
     global current_project
 
     if current_project is None:
@@ -1611,6 +1554,20 @@ def get_seed_settings() -> Tuple[bool, int]:
 # ========================================
 IMAGE_WORKFLOW_FILE = "workflows/img.json"
 
+
+@functools.lru_cache(maxsize=4)
+def _read_workflow_text(workflow_path: str, mtime_ns: int) -> str:
+    """读取工作流文件内容（按修改时间缓存，文件更新后自动重新读取）"""
+    with open(workflow_path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def load_workflow_json(workflow_path: Path) -> dict:
+    """加载工作流 JSON，每次返回新的字典，调用方可以直接修改节点参数"""
+    text = _read_workflow_text(str(workflow_path), workflow_path.stat().st_mtime_ns)
+    return json.loads(text)
+
+
 # 图片尺寸映射
 IMAGE_ASPECT_RATIOS = {
     "16:9": (1024, 576),
@@ -1621,6 +1578,12 @@ IMAGE_ASPECT_RATIOS = {
     "21:9": (1024, 440),
 }
 
+# 所有调用 ComfyUI 的事件共用一个并发组：客户端按 clientId 监听同一条 WebSocket，
+# 同时只允许一个任务提交/等待，避免不同入口的任务互相抢占输出
+COMFYUI_CONCURRENCY_ID = "comfyui"
+COMFYUI_CONCURRENCY_LIMIT = 1
+
+
 def generate_image_with_comfyui(
     shot: 'Shot',
     project: 'StoryboardProject',
@@ -1645,8 +1608,7 @@ def generate_image_with_comfyui(
         if not workflow_path.exists():
             return False, None, f"工作流文件不存在: {IMAGE_WORKFLOW_FILE}"
 
-        with open(workflow_path, 'r', encoding='utf-8') as f:
-            workflow = json.load(f)
+        workflow = load_workflow_json(workflow_path)
 
         # 获取种子
         if project.lock_seed and project.generation_seed > 0:
@@ -1783,8 +1745,7 @@ def generate_video_from_shot(
             log_lines.append(f"> [错误] 工作流文件不存在")
             return "\n".join(log_lines), None
 
-        with open(workflow_path, 'r', encoding='utf-8') as f:
-            workflow = json.load(f)
+        workflow = load_workflow_json(workflow_path)
         log_lines.append(f"> [工作流] 加载成功，共 {len(workflow)} 个节点")
 
         # 获取锁定的种子
@@ -2008,8 +1969,8 @@ def generate_all_videos(
     char_refs,
     prop_refs,
     scene_ref
-) -> Tuple[str, List]:
-    """批量生成所有镜头的视频"""
+) -> Iterator[Tuple[str, Any]]:
+    """批量生成所有镜头的视频（生成器：每处理完一个镜头就推送一次当前日志，画廊只在结束时更新）"""
     global current_project
 
     log_lines = []
@@ -2026,17 +1987,20 @@ def generate_all_videos(
     if service.comfyui_client is None:
         log_lines.append("> [错误] ComfyUI 未连接")
         log_lines.append("> [提示] 请先点击「连接 ComfyUI」按钮")
-        return "\n".join(log_lines), []
+        yield "\n".join(log_lines), []
+        return
     else:
         log_lines.append(f"> [ComfyUI] 已连接: {settings.comfyui_host}:{settings.comfyui_port}")
 
     if current_project is None:
         log_lines.append("> [错误] 请先创建项目")
-        return "\n".join(log_lines), []
+        yield "\n".join(log_lines), []
+        return
 
     if not current_project.shots:
         log_lines.append("> [错误] 请先添加镜头")
-        return "\n".join(log_lines), []
+        yield "\n".join(log_lines), []
+        return
 
     total = len(current_project.shots)
     log_lines.append(f"> [统计] 共 {total} 个镜头待处理")
@@ -2049,7 +2013,8 @@ def generate_all_videos(
         if missing:
             log_lines.append(f"> [错误] 以下镜头还没有生成图片: {missing}")
             log_lines.append("> [提示] 请先在「③ 生成」中生成这些镜头的图片")
-            return "\n".join(log_lines), []
+            yield "\n".join(log_lines), []
+            return
 
     # 种子信息
     if current_project.lock_seed:
@@ -2080,6 +2045,8 @@ def generate_all_videos(
     log_lines.append("")
     log_lines.append("> [开始批量提交任务]")
     log_lines.append("-" * 50)
+    # 进度推送不改动画廊，完成后再整体刷新
+    yield "\n".join(log_lines), gr.update()
 
     success_count = 0
     fail_count = 0
@@ -2112,6 +2079,7 @@ def generate_all_videos(
             log_lines.append(f">   ✗ 镜头 {shot.shot_number} 生成失败")
 
         log_lines.append("")
+        yield "\n".join(log_lines), gr.update()
 
     log_lines.append("-" * 50)
     log_lines.append("")
@@ -2123,7 +2091,11 @@ def generate_all_videos(
     log_lines.append(f">   种子: {current_project.generation_seed if current_project.lock_seed else '随机'}")
     log_lines.append("=" * 50)
 
-    return "\n".join(log_lines), []
+    yield "\n".join(log_lines), get_video_gallery_items()
+
+
+# 批量生成过程中每次推送的日志行数上限，避免每个镜头都重发完整历史
+CLI_STREAM_TAIL_LINES = 40
 
 
 def generate_all_videos_with_cli(
@@ -2134,8 +2106,8 @@ def generate_all_videos_with_cli(
     char_refs,
     prop_refs,
     scene_ref
-) -> Tuple[str, str, List]:
-    """批量生成视频（带CLI输出）"""
+) -> Iterator[Tuple[str, str, Any]]:
+    """批量生成视频（带CLI输出，生成过程中逐个镜头推送状态和日志）"""
     print(f"[DEBUG] generate_all_videos_with_cli called with: gen_mode={gen_mode}, style={style}")
 
     # 先检查各项服务状态
@@ -2151,7 +2123,8 @@ def generate_all_videos_with_cli(
     else:
         cli_lines.append(f"> [ComfyUI] ✗ 未连接")
         cli_lines.append(f"> [提示] 请先点击「连接 ComfyUI」按钮")
-        return "ComfyUI 未连接", "\n".join(cli_lines), []
+        yield "ComfyUI 未连接", "\n".join(cli_lines), []
+        return
 
     # 检查项目状态
     if current_project:
@@ -2161,17 +2134,22 @@ def generate_all_videos_with_cli(
         cli_lines.append(f"> [图片] 已生成 {with_image} 个")
     else:
         cli_lines.append(f"> [项目] ✗ 未创建")
-        return "请先创建项目", "\n".join(cli_lines), []
+        yield "请先创建项目", "\n".join(cli_lines), []
+        return
 
     cli_lines.append("")
 
-    # 调用实际生成函数
-    log_output, gallery = generate_all_videos(
+    # 调用实际生成函数，每处理完一个镜头推送一次日志
+    header = "\n".join(cli_lines) + "\n"
+    log_output, gallery = "", []
+    for log_output, gallery in generate_all_videos(
         gen_mode, style, duration, camera, char_refs, prop_refs, scene_ref
-    )
+    ):
+        tail = "\n".join(log_output.split("\n")[-CLI_STREAM_TAIL_LINES:])
+        yield "生成中...", header + tail, gallery
 
     # 合并日志
-    full_log = "\n".join(cli_lines) + "\n" + log_output
+    full_log = header + log_output
 
     # 提取简短状态
     lines = log_output.split('\n')
@@ -2185,11 +2163,18 @@ def generate_all_videos_with_cli(
             break
 
     print(f"[DEBUG] generate_all_videos_with_cli finished with status: {status}")
-    return status, full_log, gallery
+    yield status, full_log, gallery
 
 
-def generate_single_video_with_cli(shot_num: int) -> Tuple[str, str, str, str]:
-    """生成单个视频（带CLI输出）"""
+def generate_single_video_with_cli(shot_num: str) -> Tuple[str, str, str, str, str]:
+    """生成单个视频（带CLI输出，镜头号由前端写入隐藏文本框）
+
+    最后一项回写完成的镜头号，供前端恢复对应卡片的按钮。
+    """
+    try:
+        shot_num = int(str(shot_num).strip())
+    except ValueError:
+        return f"无效的镜头编号: {shot_num}", "", get_video_cards_html(), get_video_stats_html(), str(shot_num)
     status, video_path = generate_video_from_shot(
         shot_num=shot_num,
         gen_mode="图生视频",
@@ -2202,7 +2187,7 @@ def generate_single_video_with_cli(shot_num: int) -> Tuple[str, str, str, str]:
     )
     # status 已经包含详细日志
     short_status = f"镜头 {shot_num} " + ("✓ 完成" if "✓" in status or "成功" in status else "✗ 失败")
-    return short_status, status, get_video_cards_html(), get_video_stats_html()
+    return short_status, status, get_video_cards_html(), get_video_stats_html(), str(shot_num)
 
 
 def delete_shot(shot_num: int) -> Tuple[str, List]:
@@ -2560,18 +2545,9 @@ def smart_import_apply(json_str: str) -> Tuple[str, str, List, List, List]:
             current_project.scenes.append(scene)
 
         # 添加镜头
-        template_map = {
-            "全景": ShotTemplate.T1_ESTABLISHING_WIDE,
-            "中景": ShotTemplate.T4_STANDARD_MEDIUM,
-            "特写": ShotTemplate.T6_CLOSEUP,
-            "过肩": ShotTemplate.T5_OVER_SHOULDER,
-            "低角度": ShotTemplate.T7_LOW_ANGLE,
-            "跟随": ShotTemplate.T8_FOLLOWING,
-        }
-
         for shot_data in data.get('shots', []):
             template_name = shot_data.get('template', '中景')
-            template_type = template_map.get(template_name, ShotTemplate.T4_STANDARD_MEDIUM)
+            template_type = SHOT_TEMPLATE_MAP.get(template_name, ShotTemplate.T4_STANDARD_MEDIUM)
             template_def = get_template(template_type)
 
             # 查找角色ID
@@ -2764,10 +2740,9 @@ def get_project_summary() -> str:
 
 def get_example_stories_html() -> str:
     """生成范例故事HTML"""
-    html = '<div style="display: grid; grid-template-columns: repeat(3, 1fr); gap: 16px;">'
-
+    cards = []
     for name, story in EXAMPLE_STORIES.items():
-        html += f'''
+        cards.append(f'''
         <div style="background: white; border-radius: 12px; padding: 16px; box-shadow: 0 2px 8px rgba(0,0,0,0.08);">
             <div style="font-size: 16px; font-weight: 600; margin-bottom: 8px;">🎬 {name}</div>
             <div style="font-size: 13px; color: #86868b; margin-bottom: 12px;">{story["description"]}</div>
@@ -2775,10 +2750,9 @@ def get_example_stories_html() -> str:
                 {len(story["characters"])}个角色 · {len(story["scenes"])}个场景 · {len(story["shots"])}个镜头
             </div>
         </div>
-        '''
+        ''')
 
-    html += '</div>'
-    return html
+    return f'<div style="display: grid; grid-template-columns: repeat(3, 1fr); gap: 16px;">{"".join(cards)}</div>'
 
 
 # ========================================
@@ -2857,13 +2831,75 @@ def get_step_summary(step: int) -> str:
     return ""
 
 
+# 视频文件扩展名（与镜头图片同名）
+VIDEO_FILE_EXTS = ('.mp4', '.webm', '.avi')
+
+
+def _file_mtime_ns(path: str) -> int:
+    """文件修改时间（不存在时为 0）"""
+    try:
+        return os.stat(path).st_mtime_ns
+    except (OSError, ValueError):
+        return 0
+
+
+def get_shots_fingerprint(with_videos: bool = False) -> Tuple:
+    """镜头卡片内容指纹：镜头数据、角色/场景名称及输出文件的修改时间"""
+    if current_project is None:
+        return ()
+    file_mtimes = []
+    for shot in current_project.shots:
+        if shot.output_image:
+            file_mtimes.append(_file_mtime_ns(shot.output_image))
+            if with_videos:
+                base_path = os.path.splitext(shot.output_image)[0]
+                file_mtimes.extend(_file_mtime_ns(base_path + ext) for ext in VIDEO_FILE_EXTS)
+    return (
+        id(current_project),
+        repr(current_project.shots),
+        tuple((c.id, c.name) for c in current_project.characters),
+        tuple((sc.id, sc.name) for sc in current_project.scenes),
+        tuple(file_mtimes),
+    )
+
+
+# 卡片分页：首页直接渲染，其余每页放在 <template> 中，滚动接近时由 window.mountCardPages 挂载
+CARDS_PAGE_SIZE = 24
+
+
+def paginate_cards_html(container_class: str, cards: List[str]) -> str:
+    """卡片容器HTML：只渲染第一页卡片，后续分页留在 <template> 里按需挂载"""
+    pages = "".join(
+        f'<template class="cards-page">{"".join(cards[i:i + CARDS_PAGE_SIZE])}</template>'
+        for i in range(CARDS_PAGE_SIZE, len(cards), CARDS_PAGE_SIZE)
+    )
+    sentinel = '<div class="cards-sentinel"></div>' if pages else ''
+    return f'<div class="{container_class}">{"".join(cards[:CARDS_PAGE_SIZE])}{pages}{sentinel}</div>'
+
+
+def cache_cards_html(fingerprint):
+    """卡片 HTML 缓存：内容指纹与上次相同时直接返回上次生成的 HTML"""
+    def decorator(func):
+        last = {}
+
+        @functools.wraps(func)
+        def wrapper() -> str:
+            key = fingerprint()
+            if last.get("key") != key:
+                last["html"] = func()
+                last["key"] = key
+            return last["html"]
+        return wrapper
+    return decorator
+
+
+@cache_cards_html(lambda: get_shots_fingerprint(with_videos=True))
 def get_video_cards_html() -> str:
     """生成视频镜头卡片HTML，样式与图片镜头一致，底色线框区分"""
     if current_project is None or len(current_project.shots) == 0:
         return '<div class="no-videos">暂无镜头，请先生成图片后再生成视频</div>'
 
-    cards_html = '<div class="video-cards-container">'
-
+    cards = []
     video_count = 0
     videos_data = []  # 收集视频数据用于弹窗
     for i, shot in enumerate(current_project.shots, 1):
@@ -2873,7 +2909,7 @@ def get_video_cards_html() -> str:
         if shot.output_image:
             # 视频文件命名：与图片同名但扩展名为 .mp4
             base_path = os.path.splitext(shot.output_image)[0]
-            for ext in ['.mp4', '.webm', '.avi']:
+            for ext in VIDEO_FILE_EXTS:
                 potential_video = base_path + ext
                 if os.path.exists(potential_video):
                     video_path = potential_video
@@ -2906,15 +2942,20 @@ def get_video_cards_html() -> str:
             status_icon = "🖼️"
             status_text = "需图片"
 
-        # 缩略图（使用原图作为视频封面）
-        if has_image:
+        # 缩略图（使用原图的缓存缩略图作为视频封面，失败时回退为内嵌图片）
+        thumb_urls = get_image_thumbnail_urls(shot.output_image) if has_image else {}
+        if thumb_urls:
+            thumb_html = f'<img src="{thumb_urls[THUMB_WIDTHS[0]]}" {get_thumbnail_size_attrs(shot.output_image)} class="video-thumb" loading="lazy" decoding="async" />'
+            if has_video:
+                thumb_html = f'<div class="video-thumb-wrapper">{thumb_html}<div class="video-play-icon">▶</div></div>'
+        elif has_image:
             try:
                 with open(shot.output_image, "rb") as img_file:
                     img_data = base64.b64encode(img_file.read()).decode('utf-8')
                 ext = shot.output_image.lower().split('.')[-1]
                 mime_type = {'png': 'image/png', 'jpg': 'image/jpeg', 'jpeg': 'image/jpeg', 'gif': 'image/gif', 'webp': 'image/webp'}.get(ext, 'image/png')
                 img_data_uri = f"data:{mime_type};base64,{img_data}"
-                thumb_html = f'<img src="{img_data_uri}" class="video-thumb" />'
+                thumb_html = f'<img src="{img_data_uri}" class="video-thumb" loading="lazy" decoding="async" />'
                 if has_video:
                     thumb_html = f'<div class="video-thumb-wrapper">{thumb_html}<div class="video-play-icon">▶</div></div>'
             except:
@@ -2925,11 +2966,11 @@ def get_video_cards_html() -> str:
         # 镜头描述（截断）
         desc_short = shot.description[:30] + "..." if len(shot.description) > 30 else shot.description
 
-        # 点击事件（仅当有视频时）- 使用 Gradio 触发机制
-        click_handler = f'onclick="window.previewVideoByShot({i})"' if has_video else ''
+        # 点击预览（仅当有视频时）：由页面加载脚本中的全局点击委托处理（data-has-video）
+        click_attr = 'data-has-video="1"' if has_video else ''
 
-        cards_html += f'''
-        <div class="video-card {status_class}" data-shot-num="{i}" {click_handler}>
+        cards.append(f'''
+        <div class="video-card {status_class}" data-shot-num="{i}" {click_attr}>
             <div class="video-card-header">
                 <span class="video-num">视频 {i}</span>
                 <span class="video-status" title="{status_text}">{status_icon}</span>
@@ -2939,145 +2980,12 @@ def get_video_cards_html() -> str:
             </div>
             <div class="video-desc">{desc_short}</div>
         </div>
-        '''
+        ''')
 
-    cards_html += '</div>'
+    cards_html = paginate_cards_html("video-cards-container", cards)
 
-    # 添加视频卡片样式（紫色主题区分于蓝色图片卡片）
+    # 视频卡片样式见 static/deferred.css
     cards_html += '''
-    <style>
-        .video-cards-container {
-            display: grid;
-            grid-template-columns: repeat(auto-fill, minmax(140px, 1fr));
-            gap: 10px;
-            padding: 10px 0;
-        }
-        .video-card {
-            background: linear-gradient(135deg, #1a1a2e 0%, #16213e 100%);
-            border: 2px solid #7c3aed;
-            border-radius: 8px;
-            padding: 8px;
-            cursor: pointer;
-            transition: all 0.2s;
-        }
-        .video-card:hover {
-            border-color: #a78bfa;
-            transform: translateY(-2px);
-            box-shadow: 0 4px 12px rgba(124, 58, 237, 0.3);
-        }
-        .video-card.video-completed {
-            border-color: #22c55e;
-            background: linear-gradient(135deg, #0f1a0f 0%, #1a2e1a 100%);
-        }
-        .video-card.video-pending {
-            border-color: #f59e0b;
-        }
-        .video-card.video-no-image {
-            border-color: #6b7280;
-            opacity: 0.6;
-        }
-        .video-card-header {
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            margin-bottom: 6px;
-        }
-        .video-num {
-            font-weight: 600;
-            font-size: 12px;
-            color: #a78bfa;
-        }
-        .video-card.video-completed .video-num {
-            color: #4ade80;
-        }
-        .video-status { font-size: 14px; }
-        .video-thumb-container {
-            width: 100%;
-            aspect-ratio: 16/9;
-            background: #0a0a15;
-            border-radius: 4px;
-            overflow: hidden;
-            margin-bottom: 6px;
-        }
-        .video-thumb {
-            width: 100%;
-            height: 100%;
-            object-fit: cover;
-        }
-        .video-thumb-wrapper {
-            position: relative;
-            width: 100%;
-            height: 100%;
-        }
-        .video-thumb-wrapper img {
-            width: 100%;
-            height: 100%;
-            object-fit: cover;
-        }
-        .video-play-icon {
-            position: absolute;
-            top: 50%;
-            left: 50%;
-            transform: translate(-50%, -50%);
-            width: 36px;
-            height: 36px;
-            background: rgba(34, 197, 94, 0.9);
-            border-radius: 50%;
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            color: white;
-            font-size: 14px;
-            box-shadow: 0 2px 8px rgba(0,0,0,0.3);
-        }
-        .video-thumb-placeholder {
-            width: 100%;
-            height: 100%;
-            display: flex;
-            flex-direction: column;
-            align-items: center;
-            justify-content: center;
-            color: #6b7280;
-            font-size: 11px;
-            text-align: center;
-        }
-        .video-desc {
-            font-size: 10px;
-            color: #9ca3af;
-            line-height: 1.3;
-            overflow: hidden;
-            text-overflow: ellipsis;
-            display: -webkit-box;
-            -webkit-line-clamp: 2;
-            -webkit-box-orient: vertical;
-        }
-        .video-stats {
-            text-align: center;
-            padding: 8px;
-            font-size: 12px;
-            color: #9ca3af;
-            border-top: 1px solid #333;
-            margin-top: 8px;
-        }
-        .no-videos {
-            text-align: center;
-            color: #6b7280;
-            padding: 30px;
-            font-size: 13px;
-        }
-        /* 红色危险按钮 */
-        .danger-btn {
-            background: linear-gradient(135deg, #dc2626, #b91c1c) !important;
-            border: none !important;
-            color: white !important;
-            font-weight: 600 !important;
-        }
-        .danger-btn:hover {
-            background: linear-gradient(135deg, #ef4444, #dc2626) !important;
-            box-shadow: 0 4px 12px rgba(220, 38, 38, 0.4) !important;
-        }
-    </style>
-
     <!-- JavaScript: 视频预览弹窗 -->
     <img src="data:image/gif;base64,R0lGODlhAQABAIAAAAAAAP///yH5BAEAAAAALAAAAAABAAEAAAIBRAA7"
          onload="
@@ -3094,8 +3002,9 @@ def get_video_cards_html() -> str:
                     return;
                 }
                 window.globalVideoIndex = shotNum - 1;
+                var modal = window.ensureGlobalModal('globalVideoModal');
                 window.updateVideoModal();
-                document.getElementById('globalVideoModal').style.display = 'flex';
+                modal.style.display = 'flex';
             };
 
             /* 更新视频弹窗内容 */
@@ -3107,7 +3016,9 @@ def get_video_cards_html() -> str:
                 document.getElementById('videoModalPrompt').textContent = data.prompt || '无提示词';
                 document.getElementById('videoModalNav').textContent = data.num + ' / ' + window.globalVideosData.length;
 
+                /* 播放器默认 preload="none"，只在真正打开弹窗时才加载并自动播放 */
                 var player = document.getElementById('videoModalPlayer');
+                player.autoplay = true;
                 player.src = data.video_path;
                 player.load();
             };
@@ -3115,6 +3026,7 @@ def get_video_cards_html() -> str:
             /* 关闭视频弹窗 */
             window.closeVideoModal = function() {
                 var modal = document.getElementById('globalVideoModal');
+                if (!modal) return;
                 modal.style.display = 'none';
                 var player = document.getElementById('videoModalPlayer');
                 player.pause();
@@ -3154,7 +3066,7 @@ def get_video_cards_html() -> str:
     videos_b64 = base64.b64encode(videos_json.encode('utf-8')).decode('ascii')
     update_script = f'''
     <img src="data:image/gif;base64,R0lGODlhAQABAIAAAAAAAP///yH5BAEAAAAALAAAAAABAAEAAAIBRAA7"
-         onload="try {{ window.globalVideosData = JSON.parse(atob('{videos_b64}')); console.log('[视频卡片] 已更新视频数据，共', window.globalVideosData.length, '个'); }} catch(e) {{ console.error('[视频卡片] 数据解析错误:', e); }}"
+         onload="try {{ window.globalVideosData = JSON.parse(atob('{videos_b64}')); console.log('[视频卡片] 已更新视频数据，共', window.globalVideosData.length, '个'); }} catch(e) {{ console.error('[视频卡片] 数据解析错误:', e); }} if (window.mountCardPages) window.mountCardPages();"
          style="display:none" />
     '''
     cards_html += update_script
@@ -3162,6 +3074,33 @@ def get_video_cards_html() -> str:
     return cards_html
 
 
+def get_video_gallery_items(full_index: Optional[int] = None) -> List[Tuple[str, str]]:
+    """已生成视频的画廊条目 [(封面, 标题)]
+
+    网格封面使用原图的 256px 缩略图；full_index 指定的条目（当前预览项）使用原图。
+    """
+    if current_project is None:
+        return []
+    items = []
+    for i, shot in enumerate(current_project.shots, 1):
+        if not shot.output_image or not os.path.exists(shot.output_image):
+            continue
+        base_path = os.path.splitext(shot.output_image)[0]
+        if not any(os.path.exists(base_path + ext) for ext in VIDEO_FILE_EXTS):
+            continue
+        if len(items) == full_index:
+            items.append((shot.output_image, f"视频 {i}"))
+            continue
+        thumb_path = get_image_thumbnail(shot.output_image, THUMB_WIDTHS[0])
+        items.append((str(thumb_path or shot.output_image), f"视频 {i}"))
+    return items
+
+
+def select_video_gallery_item(evt: gr.SelectData):
+    """画廊选中条目时把该条目换成原图，放大预览不再显示缩略图"""
+    return gr.Gallery(value=get_video_gallery_items(full_index=evt.index), selected_index=evt.index)
+
+
 def get_video_stats_html() -> str:
     """生成视频统计信息HTML"""
     if current_project is None or len(current_project.shots) == 0:
@@ -3184,27 +3123,29 @@ def get_video_stats_html() -> str:
     <div class="video-stats">
         📊 共 {total_shots} 个镜头 | 🖼️ {shots_with_images} 个已有图片 | 🎬 {video_count} 个已生成视频
     </div>
-    <style>
-        .video-stats {{
-            text-align: center;
-            padding: 10px;
-            font-size: 13px;
-            color: #9ca3af;
-            border-top: 1px solid #333;
-            margin-top: 10px;
-            background: rgba(124, 58, 237, 0.1);
-            border-radius: 6px;
-        }}
-    </style>
     '''
 
 
+# 单个镜头视频任务结束（成功或失败）后恢复对应卡片按钮：
+# 镜头号由 generate_single_video_with_cli 回写到隐藏文本框，即刚完成的镜头
+SHOT_VIDEO_DONE_JS = """(shotNum) => {
+    shotNum = parseInt(shotNum);
+    if (!shotNum) return;
+    var btn = document.querySelector('.shot-card[data-shot-num="' + shotNum + '"] .shot-video-btn');
+    if (btn) {
+        btn.classList.remove('generating');
+        btn.textContent = '🎬 生成视频';
+    }
+}"""
+
+
+@cache_cards_html(get_shots_fingerprint)
 def get_shot_cards_html() -> str:
     """生成镜头卡片HTML，每个镜头显示缩略图和生成按钮，支持点击弹窗预览"""
     if current_project is None or len(current_project.shots) == 0:
         return '<div class="no-shots">暂无镜头，请先在编排页添加镜头</div>'
 
-    cards_html = '<div class="shot-cards-container">'
+    cards = []
 
     # 存储每个镜头的完整数据用于弹窗
     shots_data = []
@@ -3214,16 +3155,22 @@ def get_shot_cards_html() -> str:
         status_class = "completed" if has_image else "pending"
         status_icon = "✅" if has_image else "⏳"
 
-        # 缩略图或占位符
+        # 缩略图或占位符（优先使用缓存的 WebP 缩略图，失败时回退为内嵌图片）
         img_data_uri = ""
-        if has_image:
+        img_srcset = ""
+        thumb_urls = get_image_thumbnail_urls(shot.output_image) if has_image else {}
+        if thumb_urls:
+            img_data_uri = thumb_urls[THUMB_WIDTHS[-1]]
+            img_srcset = ", ".join(f"{url} {width}w" for width, url in thumb_urls.items())
+            thumb_html = f'<img src="{thumb_urls[THUMB_WIDTHS[0]]}" {get_thumbnail_size_attrs(shot.output_image)} class="shot-thumb" loading="lazy" decoding="async" />'
+        elif has_image:
             try:
                 with open(shot.output_image, "rb") as img_file:
                     img_data = base64.b64encode(img_file.read()).decode('utf-8')
                 ext = shot.output_image.lower().split('.')[-1]
                 mime_type = {'png': 'image/png', 'jpg': 'image/jpeg', 'jpeg': 'image/jpeg', 'gif': 'image/gif', 'webp': 'image/webp'}.get(ext, 'image/png')
                 img_data_uri = f"data:{mime_type};base64,{img_data}"
-                thumb_html = f'<img src="{img_data_uri}" class="shot-thumb" />'
+                thumb_html = f'<img src="{img_data_uri}" class="shot-thumb" loading="lazy" decoding="async" />'
             except Exception as e:
                 thumb_html = '<div class="shot-thumb-placeholder">⚠️<br/>加载失败</div>'
         else:
@@ -3267,7 +3214,8 @@ def get_shot_cards_html() -> str:
             "camera_angle": shot.camera.distance if shot.camera else "未设置",
             "prompt": clean_text(shot.generated_prompt) or "未生成",
             "has_image": has_image,
-            "img_uri": img_data_uri
+            "img_uri": img_data_uri,
+            "img_srcset": img_srcset
         }
         shots_data.append(shot_info)
 
@@ -3275,12 +3223,12 @@ def get_shot_cards_html() -> str:
         video_btn_html = ""
         if has_image:
             video_btn_html = f'''
-            <button class="shot-video-btn" data-shot-num="{i}" onclick="event.stopPropagation(); window.generateShotVideo({i});">
+            <button class="shot-video-btn" data-shot-num="{i}">
                 🎬 生成视频
             </button>
             '''
 
-        cards_html += f'''
+        cards.append(f'''
         <div class="shot-card {status_class}" data-shot-num="{i}">
             <div class="shot-card-header">
                 <span class="shot-num">镜头 {i}</span>
@@ -3292,9 +3240,9 @@ def get_shot_cards_html() -> str:
             <div class="shot-desc">{desc_short}</div>
             {video_btn_html}
         </div>
-        '''
+        ''')
 
-    cards_html += '</div>'
+    cards_html = paginate_cards_html("shot-cards-container", cards)
 
     # 将镜头数据传递给全局 JavaScript
     # 使用 ensure_ascii=True 确保中文字符以 \uXXXX 形式转义
@@ -3315,27 +3263,38 @@ def get_shot_cards_html() -> str:
 
             /* 定义视频生成函数 */
             window.generateShotVideo = function(shotNum) {{
-                console.log('[镜头卡片] 触发视频生成:', shotNum);
-                var numInput = document.querySelector('#single_video_shot_num input');
-                if (numInput) {{
-                    numInput.value = shotNum;
-                    numInput.dispatchEvent(new Event('input', {{ bubbles: true }}));
-                }}
                 var btn = document.querySelector('.shot-card[data-shot-num="' + shotNum + '"] .shot-video-btn');
+                /* 同一镜头生成中时忽略重复点击 */
+                if (btn && btn.classList.contains('generating')) return;
+                console.log('[镜头卡片] 触发视频生成:', shotNum);
                 if (btn) {{
                     btn.classList.add('generating');
                     btn.textContent = '⏳ 生成中...';
                 }}
-                setTimeout(function() {{
-                    var triggerBtn = document.querySelector('#single_video_trigger_btn');
-                    if (triggerBtn) triggerBtn.click();
-                }}, 150);
+                /* 多个镜头快速连点时依次写入共享输入框再触发，避免后一次覆盖前一次的镜头号 */
+                window._videoTriggerChain = (window._videoTriggerChain || Promise.resolve()).then(function() {{
+                    return new Promise(function(resolve) {{
+                        var numInput = document.querySelector('#single_video_shot_num textarea, #single_video_shot_num input');
+                        if (numInput) {{
+                            numInput.value = shotNum;
+                            numInput.dispatchEvent(new Event('input', {{ bubbles: true }}));
+                        }}
+                        setTimeout(function() {{
+                            var triggerBtn = document.querySelector('#single_video_trigger_btn');
+                            if (triggerBtn) triggerBtn.click();
+                            resolve();
+                        }}, 150);
+                    }});
+                }});
             }};
 
             /* 更新镜头数据 */
             window.globalShotsData = {shots_json};
             console.log('[镜头卡片] 数据已更新，共', window.globalShotsData.length, '个镜头');
 
+            /* 挂载滚动接近视口的后续卡片分页 */
+            if (window.mountCardPages) window.mountCardPages();
+
             /* 如果弹窗正在显示且有数据，更新弹窗内容 */
             var modal = document.getElementById('globalShotModal');
             if (modal && modal.style.display === 'flex' && window.updateGlobalModal) {{
@@ -3353,126 +3312,6 @@ def get_shot_cards_html() -> str:
          style="display:none; width:1px; height:1px;" />
     '''
 
-    # 添加样式
-    cards_html += '''
-    <style>
-        .shot-cards-container {
-            display: grid;
-            grid-template-columns: repeat(auto-fill, minmax(150px, 1fr));
-            gap: 12px;
-            padding: 12px 0;
-        }
-        .shot-card {
-            background: var(--panel-dark, #1a1a2e);
-            border: 1px solid var(--border-dark, #333);
-            border-radius: 8px;
-            padding: 10px;
-            cursor: pointer;
-            transition: all 0.2s;
-        }
-        .shot-card:hover {
-            border-color: var(--primary, #137fec);
-            transform: translateY(-2px);
-            box-shadow: 0 4px 12px rgba(19, 127, 236, 0.2);
-        }
-        .shot-card.completed {
-            border-color: rgba(34, 197, 94, 0.5);
-        }
-        .shot-card-header {
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            margin-bottom: 8px;
-        }
-        .shot-num {
-            font-weight: 600;
-            font-size: 13px;
-            color: var(--text-primary, #fff);
-        }
-        .shot-status { font-size: 14px; }
-        .shot-thumb-container {
-            width: 100%;
-            aspect-ratio: 16/9;
-            background: #0a0a15;
-            border-radius: 6px;
-            overflow: hidden;
-            margin-bottom: 8px;
-        }
-        .shot-thumb {
-            width: 100%;
-            height: 100%;
-            object-fit: cover;
-        }
-        .shot-thumb-placeholder {
-            width: 100%;
-            height: 100%;
-            display: flex;
-            flex-direction: column;
-            align-items: center;
-            justify-content: center;
-            color: var(--text-secondary, #86868b);
-            font-size: 12px;
-            text-align: center;
-        }
-        .shot-desc {
-            font-size: 11px;
-            color: var(--text-secondary, #86868b);
-            line-height: 1.4;
-            overflow: hidden;
-            text-overflow: ellipsis;
-            display: -webkit-box;
-            -webkit-line-clamp: 2;
-            -webkit-box-orient: vertical;
-        }
-        .shot-video-btn {
-            width: 100%;
-            margin-top: 8px;
-            padding: 6px 10px;
-            background: linear-gradient(135deg, #dc2626, #b91c1c);
-            border: none;
-            border-radius: 6px;
-            color: white;
-            font-size: 12px;
-            font-weight: 600;
-            cursor: pointer;
-            transition: all 0.2s;
-        }
-        .shot-video-btn:hover {
-            background: linear-gradient(135deg, #ef4444, #dc2626);
-            transform: scale(1.02);
-            box-shadow: 0 2px 8px rgba(220, 38, 38, 0.4);
-        }
-        .shot-video-btn:active {
-            transform: scale(0.98);
-        }
-        .shot-video-btn.generating {
-            background: linear-gradient(135deg, #f59e0b, #d97706);
-            cursor: wait;
-            animation: pulse 1.5s infinite;
-        }
-        @keyframes pulse {
-            0%, 100% { opacity: 1; }
-            50% { opacity: 0.7; }
-        }
-        .no-shots {
-            text-align: center;
-            color: var(--text-secondary, #86868b);
-            padding: 40px;
-        }
-
-        @media (max-width: 768px) {
-            .shot-cards-container {
-                grid-template-columns: repeat(2, 1fr);
-            }
-        }
-        @media (max-width: 480px) {
-            .shot-cards-container {
-                grid-template-columns: 1fr;
-            }
-        }
-    </style>
-    '''
-
     return cards_html
 
 
@@ -3497,7 +3336,7 @@ def get_workflow_indicator(current_step: int = 0) -> str:
         status_text = "✓ 全部完成！可导出作品"
         status_class = "completed"
 
-    steps_html = ""
+    steps_parts = []
     for i, step in enumerate(steps, 1):
         if i < current_step:
             step_class = "completed"
@@ -3509,15 +3348,16 @@ def get_workflow_indicator(current_step: int = 0) -> str:
             step_class = ""
             icon = step["num"]
 
-        steps_html += f'''
-        <div class="workflow-step {step_class}" onclick="document.querySelector('[id$=\\'tab-{['create','arrange','generate','export'][i-1]}\\']')?.click()">
+        steps_parts.append(f'''
+        <div class="workflow-step {step_class}" data-nav-tab="{i - 1}">
             <div class="step-icon">{icon}</div>
             <div class="step-info">
                 <h4>{step["title"]}</h4>
                 <p>{step["desc"]}</p>
             </div>
         </div>
-        '''
+        ''')
+    steps_html = "".join(steps_parts)
 
     return f'''
     <div class="workflow-progress">
@@ -3532,6 +3372,33 @@ def get_workflow_indicator(current_step: int = 0) -> str:
     '''
 
 
+# 工作流进度切换：指示器只渲染一次，后端只返回步骤号，由前端切换各步骤的样式和状态文字
+WORKFLOW_INDICATOR_JS = """(step) => {
+    step = parseInt(step) || 0;
+    var root = document.querySelector('.workflow-progress');
+    if (!root) return;
+    var titles = [];
+    root.querySelectorAll('.workflow-step').forEach(function(el, idx) {
+        var n = idx + 1;
+        el.classList.toggle('completed', n < step);
+        el.classList.toggle('current', n === step);
+        el.querySelector('.step-icon').textContent = n < step ? '✓' : String(n);
+        titles.push([el.querySelector('h4').textContent, el.querySelector('p').textContent]);
+    });
+    var status = root.querySelector('.workflow-progress-status');
+    status.classList.remove('in-progress', 'completed');
+    if (step === 0) {
+        status.textContent = '请选择范例或创建项目开始';
+    } else if (step < 4) {
+        status.textContent = '当前步骤：' + titles[step - 1][0] + ' → ' + titles[step - 1][1];
+        status.classList.add('in-progress');
+    } else {
+        status.textContent = '✓ 全部完成！可导出作品';
+        status.classList.add('completed');
+    }
+}"""
+
+
 # ========================================
 # AI 服务 (ComfyUI 集成)
 # ========================================
@@ -3569,24 +3436,16 @@ def get_comfyui_status() -> Tuple[str, str]:
     host = settings.comfyui_host
     port = settings.comfyui_port
 
-    if service.comfyui_client is not None:
-        # 已连接，尝试ping确认
-        try:
-            import requests
-            resp = requests.get(f"http://{host}:{port}/system_stats", timeout=2)
-            if resp.status_code == 200:
-                return (
-                    f'<div class="comfyui-status connected">🟢 ComfyUI 已连接 ({host}:{port})</div>',
-                    "connected"
-                )
-        except:
-            pass
-
-    # 尝试连接
+    # 只探测一次，再根据是否已建立客户端区分“已连接”和“可用”
     try:
         import requests
         resp = requests.get(f"http://{host}:{port}/system_stats", timeout=2)
         if resp.status_code == 200:
+            if service.comfyui_client is not None:
+                return (
+                    f'<div class="comfyui-status connected">🟢 ComfyUI 已连接 ({host}:{port})</div>',
+                    "connected"
+                )
             return (
                 f'<div class="comfyui-status available">🟡 ComfyUI 可用 ({host}:{port}) - 点击连接</div>',
                 "available"
@@ -3600,6 +3459,26 @@ def get_comfyui_status() -> Tuple[str, str]:
     )
 
 
+async def get_comfyui_status_async() -> Tuple[str, str]:
+    """异步获取 ComfyUI 连接状态：先用短超时探测端口，端口不通时立即返回，不占用工作线程"""
+    host = settings.comfyui_host
+    port = settings.comfyui_port
+    try:
+        _, writer = await asyncio.wait_for(asyncio.open_connection(host, int(port)), timeout=0.5)
+    except (OSError, ValueError, asyncio.TimeoutError):
+        return (
+            f'<div class="comfyui-status disconnected">🔴 ComfyUI 未连接 ({host}:{port})</div>',
+            "disconnected"
+        )
+    # 探测连接等待关闭完成，避免遗留未关闭的传输
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except OSError:
+        pass
+    return await asyncio.to_thread(get_comfyui_status)
+
+
 def connect_comfyui() -> Tuple[str, str]:
     """连接 ComfyUI 并加载默认工作流
 
@@ -3831,9 +3710,19 @@ API_CONFIG = {
     "video": {"provider": "智谱 CogVideoX (推荐)", "api_key": "", "api_url": ""}
 }
 
+# 界面未展示的 API 配置字段默认值（与 save_*_config 的参数名一致）
+API_COMPAT_DEFAULTS = {
+    "api_url_cn": "",
+    "provider_intl": "",
+    "api_key_intl": "",
+    "api_url_intl": "",
+}
+
 def save_llm_config(provider_cn, api_key_cn, api_url_cn, provider_intl, api_key_intl, api_url_intl):
     """保存大语言模型 API 配置"""
     global API_CONFIG
+    # 模型/地址可能变化，旧配置生成的项目摘要不再复用
+    _cached_project_summary.cache_clear()
     # 优先使用国内配置
     if provider_cn and api_key_cn:
         API_CONFIG["llm"] = {
@@ -3895,46 +3784,52 @@ def save_video_config(provider_cn, api_key_cn, api_url_cn, provider_intl, api_ke
         return f"✅ 已保存视频生成配置: {provider_intl}"
     return "⚠️ 请选择服务商并填写 API Key"
 
+# LLM 服务商默认 API 地址
+DEFAULT_LLM_URLS = {
+    "DeepSeek": "https://api.deepseek.com/chat/completions",
+    "智谱 GLM (推荐)": "https://open.bigmodel.cn/api/paas/v4/chat/completions",
+    "智谱 GLM": "https://open.bigmodel.cn/api/paas/v4/chat/completions",
+    "通义千问": "https://dashscope.aliyuncs.com/api/v1/services/aigc/text-generation/generation",
+    "百度文心": "https://aip.baidubce.com/rpc/2.0/ai_custom/v1/wenxinworkshop/chat/completions",
+    "讯飞星火": "wss://spark-api.xf-yun.com/v3.5/chat",
+    "月之暗面 Kimi": "https://api.moonshot.cn/v1/chat/completions",
+    "OpenAI GPT": "https://api.openai.com/v1/chat/completions",
+    "Anthropic Claude": "https://api.anthropic.com/v1/messages",
+    "Google Gemini": "https://generativelanguage.googleapis.com/v1beta/models/gemini-pro:generateContent"
+}
+
 def get_default_llm_url(provider):
     """获取 LLM 默认 API 地址"""
-    urls = {
-        "DeepSeek": "https://api.deepseek.com/chat/completions",
-        "智谱 GLM (推荐)": "https://open.bigmodel.cn/api/paas/v4/chat/completions",
-        "智谱 GLM": "https://open.bigmodel.cn/api/paas/v4/chat/completions",
-        "通义千问": "https://dashscope.aliyuncs.com/api/v1/services/aigc/text-generation/generation",
-        "百度文心": "https://aip.baidubce.com/rpc/2.0/ai_custom/v1/wenxinworkshop/chat/completions",
-        "讯飞星火": "wss://spark-api.xf-yun.com/v3.5/chat",
-        "月之暗面 Kimi": "https://api.moonshot.cn/v1/chat/completions",
-        "OpenAI GPT": "https://api.openai.com/v1/chat/completions",
-        "Anthropic Claude": "https://api.anthropic.com/v1/messages",
-        "Google Gemini": "https://generativelanguage.googleapis.com/v1beta/models/gemini-pro:generateContent"
-    }
-    return urls.get(provider, "")
+    return DEFAULT_LLM_URLS.get(provider, "")
+
+# 图像生成服务商默认 API 地址
+DEFAULT_IMAGE_URLS = {
+    "通义万相 (推荐)": "https://dashscope.aliyuncs.com/api/v1/services/aigc/text2image/image-synthesis",
+    "百度文心一格": "https://aip.baidubce.com/rpc/2.0/ai_custom/v1/wenxinworkshop/text2image",
+    "智谱 CogView": "https://open.bigmodel.cn/api/paas/v4/images/generations",
+    "LiblibAI": "https://www.liblib.art/api",
+    "Stability AI (SD)": "https://api.stability.ai/v1/generation",
+    "OpenAI DALL-E": "https://api.openai.com/v1/images/generations",
+    "Midjourney": "https://api.mymidjourney.ai/api"
+}
 
 def get_default_image_url(provider):
     """获取图像生成默认 API 地址"""
-    urls = {
-        "通义万相 (推荐)": "https://dashscope.aliyuncs.com/api/v1/services/aigc/text2image/image-synthesis",
-        "百度文心一格": "https://aip.baidubce.com/rpc/2.0/ai_custom/v1/wenxinworkshop/text2image",
-        "智谱 CogView": "https://open.bigmodel.cn/api/paas/v4/images/generations",
-        "LiblibAI": "https://www.liblib.art/api",
-        "Stability AI (SD)": "https://api.stability.ai/v1/generation",
-        "OpenAI DALL-E": "https://api.openai.com/v1/images/generations",
-        "Midjourney": "https://api.mymidjourney.ai/api"
-    }
-    return urls.get(provider, "")
+    return DEFAULT_IMAGE_URLS.get(provider, "")
+
+# 视频生成服务商默认 API 地址
+DEFAULT_VIDEO_URLS = {
+    "智谱 CogVideoX (推荐)": "https://open.bigmodel.cn/api/paas/v4/videos/generations",
+    "通义视频生成": "https://dashscope.aliyuncs.com/api/v1/services/aigc/video-generation",
+    "可灵 AI": "https://api.kuaishou.com/klingai",
+    "Runway Gen-3": "https://api.runwayml.com/v1",
+    "Pika Labs": "https://api.pika.art/v1",
+    "Luma AI": "https://api.lumalabs.ai/v1"
+}
 
 def get_default_video_url(provider):
     """获取视频生成默认 API 地址"""
-    urls = {
-        "智谱 CogVideoX (推荐)": "https://open.bigmodel.cn/api/paas/v4/videos/generations",
-        "通义视频生成": "https://dashscope.aliyuncs.com/api/v1/services/aigc/video-generation",
-        "可灵 AI": "https://api.kuaishou.com/klingai",
-        "Runway Gen-3": "https://api.runwayml.com/v1",
-        "Pika Labs": "https://api.pika.art/v1",
-        "Luma AI": "https://api.lumalabs.ai/v1"
-    }
-    return urls.get(provider, "")
+    return DEFAULT_VIDEO_URLS.get(provider, "")
 
 
 # ========================================
@@ -3950,8 +3845,12 @@ import queue
 cli_output_queue = queue.Queue()
 cli_output_history = []
 
+class LLMCallError(Exception):
+    """LLM 调用失败，异常消息即显示给用户的提示文本"""
+
+
 def call_claude_cli(prompt: str, system_prompt: str = "") -> str:
-    """通过 Claude Code CLI 调用 AI（默认方式）"""
+    """通过 Claude Code CLI 调用 AI（默认方式），失败时抛出 LLMCallError"""
     global cli_output_history
 
     try:
@@ -3980,20 +3879,22 @@ def call_claude_cli(prompt: str, system_prompt: str = "") -> str:
         else:
             error_msg = result.stderr.strip() if result.stderr else "未知错误"
             cli_output_history.append(f"[错误] {error_msg[:100]}")
-            return f"⚠️ CLI 调用失败: {error_msg}"
+            raise LLMCallError(f"⚠️ CLI 调用失败: {error_msg}")
 
+    except LLMCallError:
+        raise
     except subprocess.TimeoutExpired:
         cli_output_history.append("[超时] Claude CLI 响应超时")
-        return "⚠️ Claude CLI 响应超时，请稍后重试"
+        raise LLMCallError("⚠️ Claude CLI 响应超时，请稍后重试")
     except FileNotFoundError:
         cli_output_history.append("[错误] 未找到 claude 命令")
-        return "⚠️ 未找到 claude 命令，请确保 Claude Code CLI 已安装并在 PATH 中"
+        raise LLMCallError("⚠️ 未找到 claude 命令，请确保 Claude Code CLI 已安装并在 PATH 中")
     except Exception as e:
         cli_output_history.append(f"[错误] {str(e)[:100]}")
-        return f"⚠️ 调用出错: {str(e)}"
+        raise LLMCallError(f"⚠️ 调用出错: {str(e)}")
 
 
-def get_cli_output() -> str:
+async def get_cli_output() -> str:
     """获取 CLI 输出历史"""
     global cli_output_history
     # 只保留最近 50 条
@@ -4002,15 +3903,22 @@ def get_cli_output() -> str:
     return "\n".join(cli_output_history[-20:]) if cli_output_history else "等待 AI 调用..."
 
 
-def clear_cli_output() -> str:
+async def clear_cli_output() -> str:
     """清空 CLI 输出"""
     global cli_output_history
     cli_output_history = []
     return "已清空"
 
 
-def call_llm_api(prompt: str, system_prompt: str = "") -> str:
-    """调用 LLM API 生成文本 - 默认使用 Claude Code CLI"""
+def _require_llm_text(text: Optional[str]) -> str:
+    """API 返回内容为空时视为调用失败"""
+    if not text:
+        raise LLMCallError("生成失败")
+    return text
+
+
+def request_llm_text(prompt: str, system_prompt: str = "") -> str:
+    """调用 LLM API 生成文本 - 默认使用 Claude Code CLI，失败时抛出 LLMCallError"""
     global API_CONFIG
 
     llm_config = API_CONFIG.get("llm", {})
@@ -4052,9 +3960,9 @@ def call_llm_api(prompt: str, system_prompt: str = "") -> str:
             response = requests.post(api_url, headers=headers, json=data, timeout=30)
             if response.status_code == 200:
                 result = response.json()
-                return result.get("choices", [{}])[0].get("message", {}).get("content", "生成失败")
+                return _require_llm_text(result.get("choices", [{}])[0].get("message", {}).get("content"))
             else:
-                return f"API 调用失败: {response.status_code} - {response.text[:100]}"
+                raise LLMCallError(f"API 调用失败: {response.status_code} - {response.text[:100]}")
 
         # 通义千问 API 格式
         elif "通义" in provider or "dashscope" in api_url:
@@ -4075,9 +3983,9 @@ def call_llm_api(prompt: str, system_prompt: str = "") -> str:
             response = requests.post(api_url, headers=headers, json=data, timeout=30)
             if response.status_code == 200:
                 result = response.json()
-                return result.get("output", {}).get("text", "生成失败")
+                return _require_llm_text(result.get("output", {}).get("text"))
             else:
-                return f"API 调用失败: {response.status_code}"
+                raise LLMCallError(f"API 调用失败: {response.status_code}")
 
         # Anthropic Claude API 格式
         elif "Claude" in provider or "anthropic" in api_url:
@@ -4099,9 +4007,9 @@ def call_llm_api(prompt: str, system_prompt: str = "") -> str:
             response = requests.post(api_url, headers=headers, json=data, timeout=30)
             if response.status_code == 200:
                 result = response.json()
-                return result.get("content", [{}])[0].get("text", "生成失败")
+                return _require_llm_text(result.get("content", [{}])[0].get("text"))
             else:
-                return f"API 调用失败: {response.status_code}"
+                raise LLMCallError(f"API 调用失败: {response.status_code}")
 
         # DeepSeek API 格式 (OpenAI 兼容)
         elif "DeepSeek" in provider or "deepseek" in api_url:
@@ -4124,9 +4032,9 @@ def call_llm_api(prompt: str, system_prompt: str = "") -> str:
             response = requests.post(api_url, headers=headers, json=data, timeout=60)
             if response.status_code == 200:
                 result = response.json()
-                return result.get("choices", [{}])[0].get("message", {}).get("content", "生成失败")
+                return _require_llm_text(result.get("choices", [{}])[0].get("message", {}).get("content"))
             else:
-                return f"API 调用失败: {response.status_code} - {response.text[:100]}"
+                raise LLMCallError(f"API 调用失败: {response.status_code} - {response.text[:100]}")
 
         # OpenAI 兼容格式 (默认)
         else:
@@ -4149,14 +4057,24 @@ def call_llm_api(prompt: str, system_prompt: str = "") -> str:
             response = requests.post(api_url, headers=headers, json=data, timeout=30)
             if response.status_code == 200:
                 result = response.json()
-                return result.get("choices", [{}])[0].get("message", {}).get("content", "生成失败")
+                return _require_llm_text(result.get("choices", [{}])[0].get("message", {}).get("content"))
             else:
-                return f"API 调用失败: {response.status_code}"
+                raise LLMCallError(f"API 调用失败: {response.status_code}")
 
+    except LLMCallError:
+        raise
     except requests.exceptions.Timeout:
-        return "⚠️ API 请求超时，请稍后重试"
+        raise LLMCallError("⚠️ API 请求超时，请稍后重试")
     except Exception as e:
-        return f"⚠️ API 调用出错: {str(e)}"
+        raise LLMCallError(f"⚠️ API 调用出错: {str(e)}")
+
+
+def call_llm_api(prompt: str, system_prompt: str = "") -> str:
+    """调用 LLM 生成文本，失败时返回提示文本（供界面直接显示）"""
+    try:
+        return request_llm_text(prompt, system_prompt)
+    except LLMCallError as e:
+        return str(e)
 
 
 def ai_generate_character_desc(name: str) -> str:
@@ -4247,8 +4165,14 @@ def ai_optimize_prompt(original_prompt: str, style: str = "电影感") -> str:
     return result
 
 
+@functools.lru_cache(maxsize=16)
+def _cached_project_summary(provider: str, prompt: str, system_prompt: str) -> str:
+    """按 (LLM 提供方, 提示词) 缓存项目摘要；调用失败会抛出 LLMCallError，不进入缓存"""
+    return request_llm_text(prompt, system_prompt)
+
+
 def ai_generate_project_summary() -> str:
-    """AI 生成项目摘要"""
+    """AI 生成项目摘要（项目信息未变化时复用上次结果）"""
     global current_project
 
     if not current_project or (not current_project.characters and not current_project.shots):
@@ -4273,37 +4197,254 @@ def ai_generate_project_summary() -> str:
 - 角色 ({len(char_names)}个): {', '.join(char_names) if char_names else '无'}
 - 场景 ({len(scene_names)}个): {', '.join(scene_names) if scene_names else '无'}
 - 镜头数量: {shot_count}
-- 镜头类型分布: {', '.join(set(shot_types)) if shot_types else '无'}
+- 镜头类型分布: {', '.join(sorted(set(shot_types))) if shot_types else '无'}
 
 请生成项目摘要："""
 
-    result = call_llm_api(prompt, system_prompt)
-    return result
+    provider = API_CONFIG.get("llm", {}).get("provider", "")
+    try:
+        return _cached_project_summary(provider, prompt, system_prompt)
+    except LLMCallError as e:
+        return str(e)
 
 
 # ========================================
-# 构建界面
+# 全局预览弹窗模板（首次打开时由 JS 按需创建）
 # ========================================
 
-def create_ui():
-    """创建界面 - PC 全屏优化布局 (深色主题)"""
-
-    # 深色主题配色方案 (参考模板设计)
-    dark_theme = gr.themes.Base(
-        primary_hue="blue",
-        secondary_hue="slate",
-        neutral_hue="slate",
-        font=["Inter", "system-ui", "sans-serif"],
-        font_mono=["JetBrains Mono", "Consolas", "monospace"],
-    ).set(
-        # 背景色
-        body_background_fill="#101922",
-        body_background_fill_dark="#101922",
-        background_fill_primary="#16202a",
-        background_fill_primary_dark="#16202a",
-        background_fill_secondary="#1c252e",
-        background_fill_secondary_dark="#1c252e",
-        # 边框
+GLOBAL_MODAL_TEMPLATES = {
+    "globalShotModal": """
+    <div id="globalShotModal" class="shot-modal-global" style="display:none;">
+        <div class="shot-modal-content">
+            <div class="shot-modal-header">
+                <span id="globalModalTitle">镜头预览</span>
+                <button class="shot-modal-close" onclick="window.closeGlobalModal()">&times;</button>
+            </div>
+            <div class="shot-modal-body">
+                <div class="shot-modal-image-container">
+                    <div id="globalModalImage"></div>
+                </div>
+                <div class="shot-modal-info">
+                    <div class="info-section">
+                        <div class="info-label">镜头描述</div>
+                        <div id="globalModalDesc" class="info-value"></div>
+                    </div>
+                    <div class="info-row">
+                        <div class="info-item"><span class="info-label">角色</span><span id="globalModalChars" class="info-value"></span></div>
+                        <div class="info-item"><span class="info-label">场景</span><span id="globalModalScene" class="info-value"></span></div>
+                    </div>
+                    <div class="info-row">
+                        <div class="info-item"><span class="info-label">景别</span><span id="globalModalType" class="info-value"></span></div>
+                        <div class="info-item"><span class="info-label">镜头角度</span><span id="globalModalAngle" class="info-value"></span></div>
+                    </div>
+                    <div class="info-section">
+                        <div class="info-label">生成提示词</div>
+                        <div id="globalModalPrompt" class="info-value prompt-text"></div>
+                    </div>
+                </div>
+            </div>
+            <div class="shot-modal-nav">
+                <button class="nav-btn" onclick="window.navigateGlobalShot(-1)">◀ 上一个</button>
+                <span id="globalModalNav">1 / 7</span>
+                <button class="nav-btn" onclick="window.navigateGlobalShot(1)">下一个 ▶</button>
+            </div>
+        </div>
+    </div>
+""",
+    "globalVideoModal": """
+    <div id="globalVideoModal" class="video-modal-global" style="display:none;">
+        <div class="video-modal-content">
+            <div class="video-modal-header">
+                <span id="videoModalTitle">视频预览</span>
+                <button class="video-modal-close" onclick="window.closeVideoModal()">&times;</button>
+            </div>
+            <div class="video-modal-body">
+                <div class="video-modal-player">
+                    <video id="videoModalPlayer" controls preload="none" playsinline style="width:100%; max-height:60vh; background:#000;">
+                        您的浏览器不支持视频播放
+                    </video>
+                </div>
+                <div class="video-modal-info">
+                    <div class="info-section">
+                        <div class="info-label">生成提示词</div>
+                        <div id="videoModalPrompt" class="info-value prompt-text"></div>
+                    </div>
+                </div>
+            </div>
+            <div class="video-modal-nav">
+                <button class="nav-btn" onclick="window.navigateVideo(-1)">◀ 上一个</button>
+                <span id="videoModalNav">1 / 7</span>
+                <button class="nav-btn" onclick="window.navigateVideo(1)">下一个 ▶</button>
+            </div>
+        </div>
+    </div>
+""",
+}
+
+
+# 界面中的静态 HTML 片段（模块加载时构建一次，create_ui 直接引用）
+# 顶部导航栏
+APP_HEADER_HTML = """
+<link href="https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700&display=swap" rel="stylesheet">
+<link href="https://fonts.googleapis.com/css2?family=Material+Symbols+Outlined:wght,FILL@100..700,0..1" rel="stylesheet">
+
+<!-- 顶部导航栏 -->
+<div class="app-header">
+    <div class="logo">
+        <div class="logo-icon">🎬</div>
+        <h1>AI 分镜 Pro</h1>
+    </div>
+    <div class="status-pill">
+        <div class="status-dot"></div>
+        <span>系统运行中</span>
+    </div>
+</div>
+
+<!-- JavaScript 已移至 gr.Blocks(js=...) 参数中，样式已移至 static/app.css 和 static/deferred.css -->
+<!-- 镜头/视频预览弹窗在首次打开时由 JS 创建（见 GLOBAL_MODAL_TEMPLATES） -->
+"""
+
+# 新手快速开始区域
+QUICK_START_HTML = """
+<div class="quick-start-banner">
+    <div class="qs-icon">🚀</div>
+    <div class="qs-content">
+        <h3>新手？一键开始体验</h3>
+        <p>点击下方任意范例模板，立即加载完整的角色、场景和镜头数据，快速了解系统工作流程。</p>
+    </div>
+</div>
+"""
+
+# 一句话生成故事标题
+AI_STORY_HEADER_HTML = """
+<div class="ai-gen-header">
+    <span class="ai-icon">✨</span>
+    <div>
+        <h4>一句话生成故事</h4>
+        <p>输入你的创意，AI 自动生成完整的角色、场景和分镜</p>
+    </div>
+</div>
+"""
+
+# 范例模板卡片（点击由全局事件委托处理，data-template 对应 TEMPLATE_STORY_NAMES 的键）
+TEMPLATE_CARDS_HTML = {
+    "madao": """
+    <div class="template-card featured" id="template-madao" data-template="madao">
+        <div class="info">
+            <span class="badge drama">🐴 送福</span>
+            <h4>🎊 马到成功送祝福</h4>
+            <p>马年吉祥物小骏马送福上门的欢乐故事</p>
+            <span class="meta">3 角色 • 2 场景 • 7 镜头</span>
+            <button class="template-load-btn">✨ 加载此范例</button>
+        </div>
+    </div>
+""",
+    "junma": """
+    <div class="template-card" id="template-junma" data-template="junma">
+        <div class="info">
+            <span class="badge action">🏠 团圆</span>
+            <h4>🎆 骏马奔腾迎新年</h4>
+            <p>马家大院除夕团圆，龙马精神迎新春</p>
+            <span class="meta">5 角色 • 2 场景 • 7 镜头</span>
+            <button class="template-load-btn">加载此范例</button>
+        </div>
+    </div>
+""",
+    "mashang": """
+    <div class="template-card" id="template-mashang" data-template="mashang">
+        <div class="info">
+            <span class="badge drama">🍜 美食</span>
+            <h4>🥟 马上有美食</h4>
+            <p>马蹄糕马卡龙，马年特色美食大展示</p>
+            <span class="meta">3 角色 • 2 场景 • 8 镜头</span>
+            <button class="template-load-btn">加载此范例</button>
+        </div>
+    </div>
+""",
+}
+
+# 模板卡片键 -> 范例故事名称
+TEMPLATE_STORY_NAMES = {
+    "madao": "马到成功送祝福",
+    "junma": "骏马奔腾迎新年",
+    "mashang": "马上有美食",
+}
+
+# 工作流程指引（步骤说明）
+WORKFLOW_GUIDE_HTML = """
+<div class="workflow-guide">
+    <h3>📋 工作流程（4个步骤）</h3>
+    <p class="guide-desc">加载范例后，按顺序完成以下步骤即可生成分镜作品</p>
+    <div class="steps-container">
+        <div class="step-item">
+            <div class="step-num">1</div>
+            <div class="step-info">
+                <h4>创建</h4>
+                <p>添加角色和场景</p>
+            </div>
+            <div class="step-arrow">→</div>
+        </div>
+        <div class="step-item">
+            <div class="step-num">2</div>
+            <div class="step-info">
+                <h4>编排</h4>
+                <p>设计镜头顺序</p>
+            </div>
+            <div class="step-arrow">→</div>
+        </div>
+        <div class="step-item">
+            <div class="step-num">3</div>
+            <div class="step-info">
+                <h4>生成</h4>
+                <p>AI 生成图像</p>
+            </div>
+            <div class="step-arrow">→</div>
+        </div>
+        <div class="step-item last">
+            <div class="step-num done">4</div>
+            <div class="step-info">
+                <h4>导出</h4>
+                <p>下载成品</p>
+            </div>
+        </div>
+    </div>
+</div>
+"""
+
+# 快速导航按钮（data-nav-tab 为目标标签页序号，点击由全局事件委托处理）
+WORKFLOW_NAV_HTML = """
+<div class="workflow-nav-buttons">
+    <button data-nav-tab="0">① 创建角色/场景</button>
+    <button data-nav-tab="1">② 编排镜头</button>
+    <button data-nav-tab="2">③ 生成图像</button>
+    <button data-nav-tab="3">④ 导出作品</button>
+</div>
+"""
+
+
+# ========================================
+# 构建界面
+# ========================================
+
+def create_ui():
+    """创建界面 - PC 全屏优化布局 (深色主题)"""
+
+    # 深色主题配色方案 (参考模板设计)
+    dark_theme = gr.themes.Base(
+        primary_hue="blue",
+        secondary_hue="slate",
+        neutral_hue="slate",
+        font=["Inter", "system-ui", "sans-serif"],
+        font_mono=["JetBrains Mono", "Consolas", "monospace"],
+    ).set(
+        # 背景色
+        body_background_fill="#101922",
+        body_background_fill_dark="#101922",
+        background_fill_primary="#16202a",
+        background_fill_primary_dark="#16202a",
+        background_fill_secondary="#1c252e",
+        background_fill_secondary_dark="#1c252e",
+        # 边框
         border_color_primary="#233648",
         border_color_primary_dark="#233648",
         border_color_accent="#137fec",
@@ -4349,1239 +4490,24 @@ def create_ui():
     ) as demo:
 
         # ===== 全局样式 =====
-        gr.HTML("""
-        <link href="https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700&display=swap" rel="stylesheet">
-        <link href="https://fonts.googleapis.com/css2?family=Material+Symbols+Outlined:wght,FILL@100..700,0..1" rel="stylesheet">
-        <style>
-            /* ===== 全局深色主题 ===== */
-            :root {
-                --bg-dark: #101922;
-                --surface-dark: #16202a;
-                --panel-dark: #1c252e;
-                --card-dark: #1e2936;
-                --border-dark: #233648;
-                --primary: #137fec;
-                --text-primary: #e2e8f0;
-                --text-secondary: #92adc9;
-            }
-
-            body, .gradio-container {
-                background: var(--bg-dark) !important;
-                font-family: 'Inter', system-ui, sans-serif !important;
-            }
-
-            /* 隐藏行不占空间 */
-            .gradio-row[style*="display: none"],
-            .gradio-column[style*="display: none"],
-            .hidden, [hidden] {
-                display: none !important;
-                margin: 0 !important;
-                padding: 0 !important;
-                height: 0 !important;
-                overflow: hidden !important;
-            }
-
-            /* ===== 顶部导航栏 ===== */
-            .app-header {
-                background: var(--bg-dark);
-                padding: 12px 24px;
-                border-bottom: 1px solid var(--border-dark);
-                display: flex;
-                justify-content: space-between;
-                align-items: center;
-                margin: -16px -16px 16px -16px;
-            }
-            .app-header .logo {
-                display: flex;
-                align-items: center;
-                gap: 12px;
-            }
-            .app-header .logo-icon {
-                width: 36px;
-                height: 36px;
-                background: var(--primary);
-                border-radius: 8px;
-                display: flex;
-                align-items: center;
-                justify-content: center;
-                color: white;
-                font-size: 20px;
-            }
-            .app-header h1 {
-                color: white;
-                font-size: 18px;
-                font-weight: 700;
-                margin: 0;
-            }
-            .status-pill {
-                background: var(--card-dark);
-                border: 1px solid var(--border-dark);
-                padding: 6px 14px;
-                border-radius: 20px;
-                color: var(--text-secondary);
-                font-size: 12px;
-                display: flex;
-                align-items: center;
-                gap: 8px;
-            }
-            .status-dot {
-                width: 8px;
-                height: 8px;
-                background: #22c55e;
-                border-radius: 50%;
-                position: relative;
-            }
-            .status-dot::before {
-                content: '';
-                position: absolute;
-                inset: 0;
-                background: #22c55e;
-                border-radius: 50%;
-                animation: ping 2s cubic-bezier(0, 0, 0.2, 1) infinite;
-            }
-            @keyframes ping {
-                75%, 100% { transform: scale(2); opacity: 0; }
-            }
-
-            /* ===== 英雄区域 ===== */
-            .hero-section {
-                background: linear-gradient(135deg, rgba(19, 127, 236, 0.15) 0%, rgba(16, 25, 34, 0.9) 100%),
-                            linear-gradient(180deg, #16202a 0%, #101922 100%);
-                border: 1px solid var(--border-dark);
-                border-radius: 12px;
-                padding: 32px;
-                margin-bottom: 24px;
-                position: relative;
-                overflow: hidden;
-            }
-            .hero-section::before {
-                content: '';
-                position: absolute;
-                top: -50%;
-                right: -20%;
-                width: 60%;
-                height: 200%;
-                background: radial-gradient(circle, rgba(19, 127, 236, 0.1) 0%, transparent 60%);
-                pointer-events: none;
-            }
-            .hero-section h2 {
-                color: white;
-                font-size: 28px;
-                font-weight: 700;
-                margin: 0 0 8px 0;
-            }
-            .hero-section p {
-                color: var(--text-secondary);
-                font-size: 15px;
-                margin: 0;
-            }
-            .hero-actions {
-                display: flex;
-                gap: 12px;
-                margin-top: 24px;
-            }
-            .hero-btn {
-                padding: 10px 20px;
-                border-radius: 8px;
-                font-size: 14px;
-                font-weight: 500;
-                cursor: pointer;
-                border: none;
-                display: flex;
-                align-items: center;
-                gap: 8px;
-                transition: all 0.2s;
-            }
-            .hero-btn-primary {
-                background: var(--primary);
-                color: white;
-            }
-            .hero-btn-primary:hover {
-                background: #1a8cff;
-                box-shadow: 0 4px 12px rgba(19, 127, 236, 0.4);
-            }
-            .hero-btn-secondary {
-                background: rgba(255,255,255,0.1);
-                color: white;
-                border: 1px solid rgba(255,255,255,0.1);
-            }
-            .hero-btn-secondary:hover {
-                background: rgba(255,255,255,0.15);
-            }
-
-            /* ===== 工作流卡片 ===== */
-            .workflow-section {
-                margin-bottom: 24px;
-            }
-            .workflow-section h3 {
-                color: white;
-                font-size: 16px;
-                font-weight: 600;
-                margin: 0 0 16px 0;
-            }
-            .workflow-grid {
-                display: grid;
-                grid-template-columns: repeat(4, 1fr);
-                gap: 16px;
-            }
-            .workflow-card {
-                background: var(--card-dark);
-                border: 1px solid var(--border-dark);
-                border-radius: 12px;
-                padding: 16px;
-                cursor: pointer;
-                transition: all 0.2s;
-            }
-            .workflow-card:hover {
-                border-color: rgba(19, 127, 236, 0.5);
-                box-shadow: 0 0 20px rgba(19, 127, 236, 0.15);
-                transform: translateY(-2px);
-            }
-            .workflow-card .icon-box {
-                width: 100%;
-                height: 80px;
-                border-radius: 8px;
-                display: flex;
-                align-items: center;
-                justify-content: center;
-                margin-bottom: 12px;
-                font-size: 32px;
-                border: 1px solid rgba(255,255,255,0.05);
-            }
-            .workflow-card.create .icon-box { background: linear-gradient(135deg, rgba(59, 130, 246, 0.2) 0%, var(--card-dark) 100%); }
-            .workflow-card.arrange .icon-box { background: linear-gradient(135deg, rgba(99, 102, 241, 0.2) 0%, var(--card-dark) 100%); }
-            .workflow-card.generate .icon-box { background: linear-gradient(135deg, rgba(168, 85, 247, 0.2) 0%, var(--card-dark) 100%); }
-            .workflow-card.export .icon-box { background: linear-gradient(135deg, rgba(20, 184, 166, 0.2) 0%, var(--card-dark) 100%); }
-            .workflow-card h4 {
-                color: white;
-                font-size: 14px;
-                font-weight: 600;
-                margin: 0 0 4px 0;
-            }
-            .workflow-card p {
-                color: var(--text-secondary);
-                font-size: 12px;
-                margin: 0;
-            }
-
-            /* ===== 快速开始模板 ===== */
-            .templates-section h3 {
-                color: white;
-                font-size: 16px;
-                font-weight: 600;
-                margin: 0 0 16px 0;
-                display: flex;
-                justify-content: space-between;
-                align-items: center;
-            }
-            .templates-section h3 a {
-                color: var(--primary);
-                font-size: 13px;
-                font-weight: 500;
-                text-decoration: none;
-            }
-            .template-card {
-                background: var(--card-dark);
-                border: 1px solid var(--border-dark);
-                border-radius: 12px;
-                padding: 16px;
-                display: flex;
-                gap: 16px;
-                margin-bottom: 12px;
-                transition: all 0.2s;
-                position: relative;
-                cursor: pointer;
-            }
-            .template-card:hover {
-                border-color: rgba(255,255,255,0.2);
-                background: var(--panel-dark);
-            }
-            .template-card .info { flex: 1; }
-            .template-card .badge {
-                display: inline-block;
-                padding: 2px 8px;
-                border-radius: 4px;
-                font-size: 10px;
-                font-weight: 600;
-                text-transform: uppercase;
-                margin-bottom: 8px;
-            }
-            .template-card .badge.drama { background: rgba(249, 115, 22, 0.2); color: #fb923c; }
-            .template-card .badge.action { background: rgba(59, 130, 246, 0.2); color: #60a5fa; }
-            .template-card h4 {
-                color: white;
-                font-size: 14px;
-                font-weight: 600;
-                margin: 0 0 4px 0;
-            }
-            .template-card p {
-                color: var(--text-secondary);
-                font-size: 12px;
-                margin: 0 0 8px 0;
-                line-height: 1.4;
-            }
-            .template-card .meta {
-                color: #64748b;
-                font-size: 11px;
-                font-family: monospace;
-            }
-            .template-card .thumb {
-                width: 120px;
-                height: 80px;
-                border-radius: 8px;
-                background: var(--border-dark);
-                border: 1px solid rgba(255,255,255,0.1);
-                display: flex;
-                align-items: center;
-                justify-content: center;
-                font-size: 24px;
-            }
-
-            /* ===== 右侧面板 ===== */
-            .section-title {
-                font-size: 12px;
-                font-weight: 600;
-                color: var(--text-secondary);
-                text-transform: uppercase;
-                letter-spacing: 0.5px;
-                margin-bottom: 12px;
-                padding-bottom: 8px;
-                border-bottom: 1px solid var(--border-dark);
-                display: flex;
-                align-items: center;
-                gap: 8px;
-            }
-
-            /* ===== CLI 终端样式 ===== */
-            .cli-terminal {
-                background: #0a0f14;
-                border: 1px solid var(--border-dark);
-                border-radius: 8px;
-                overflow: hidden;
-            }
-            .cli-terminal-header {
-                background: var(--card-dark);
-                padding: 8px 12px;
-                border-bottom: 1px solid rgba(255,255,255,0.05);
-                display: flex;
-                justify-content: space-between;
-                align-items: center;
-            }
-            .cli-terminal-header span {
-                color: var(--text-secondary);
-                font-size: 10px;
-                font-weight: 600;
-                text-transform: uppercase;
-            }
-            .cli-terminal-dots {
-                display: flex;
-                gap: 6px;
-            }
-            .cli-terminal-dots div {
-                width: 8px;
-                height: 8px;
-                border-radius: 50%;
-            }
-            .cli-terminal-dots .red { background: rgba(239, 68, 68, 0.5); }
-            .cli-terminal-dots .yellow { background: rgba(234, 179, 8, 0.5); }
-            .cli-terminal-dots .green { background: rgba(34, 197, 94, 0.5); }
-            .cli-terminal-content {
-                padding: 12px;
-                font-family: 'JetBrains Mono', monospace;
-                font-size: 11px;
-                color: rgba(34, 197, 94, 0.9);
-                line-height: 1.6;
-                max-height: 200px;
-                overflow-y: auto;
-            }
-
-            /* ===== 项目摘要卡片 ===== */
-            .project-summary-card {
-                margin-bottom: 16px;
-            }
-            .project-summary-card:empty {
-                display: none;
-            }
-            .project-summary-content {
-                background: var(--card-dark);
-                border: 1px solid var(--border-dark);
-                border-radius: 12px;
-                padding: 16px 20px;
-            }
-            .summary-header {
-                display: flex;
-                justify-content: space-between;
-                align-items: center;
-                margin-bottom: 12px;
-                padding-bottom: 12px;
-                border-bottom: 1px solid var(--border-dark);
-            }
-            .project-title {
-                color: white;
-                font-size: 16px;
-                font-weight: 600;
-            }
-            .project-meta {
-                color: var(--text-secondary);
-                font-size: 12px;
-            }
-            .summary-progress {
-                display: flex;
-                align-items: center;
-                gap: 12px;
-                margin-bottom: 16px;
-            }
-            .progress-bar {
-                flex: 1;
-                height: 6px;
-                background: var(--surface-dark);
-                border-radius: 3px;
-                overflow: hidden;
-            }
-            .progress-fill {
-                height: 100%;
-                background: linear-gradient(90deg, #22c55e, #16a34a);
-                border-radius: 3px;
-                transition: width 0.3s;
-            }
-            .progress-text {
-                color: #22c55e;
-                font-size: 11px;
-                font-weight: 500;
-                white-space: nowrap;
-            }
-            .summary-section {
-                margin-bottom: 12px;
-            }
-            .summary-section:last-child {
-                margin-bottom: 0;
-            }
-            .section-label {
-                color: var(--text-secondary);
-                font-size: 11px;
-                font-weight: 500;
-                margin-bottom: 6px;
-            }
-            .tags-row {
-                display: flex;
-                flex-wrap: wrap;
-                gap: 6px;
-            }
-            .tag {
-                padding: 4px 10px;
-                border-radius: 6px;
-                font-size: 12px;
-                font-weight: 500;
-            }
-            .char-tag {
-                background: rgba(59, 130, 246, 0.15);
-                color: #60a5fa;
-                border: 1px solid rgba(59, 130, 246, 0.3);
-            }
-            .scene-tag {
-                background: rgba(168, 85, 247, 0.15);
-                color: #c084fc;
-                border: 1px solid rgba(168, 85, 247, 0.3);
-            }
-            .shots-preview {
-                background: var(--surface-dark);
-                border-radius: 8px;
-                padding: 8px 12px;
-            }
-            .shot-item {
-                color: var(--text-secondary);
-                font-size: 12px;
-                padding: 4px 0;
-                border-bottom: 1px solid var(--border-dark);
-            }
-            .shot-item:last-child {
-                border-bottom: none;
-            }
-            .shot-item.more {
-                color: var(--primary);
-                font-style: italic;
-            }
-            .empty {
-                color: var(--text-secondary);
-                font-size: 12px;
-                font-style: italic;
-            }
-
-            /* ===== ComfyUI 工作流设置 ===== */
-            .workflow-label {
-                color: var(--text-secondary) !important;
-                font-size: 12px !important;
-                margin: 8px 0 4px 0 !important;
-            }
-            .workflow-status {
-                font-size: 11px !important;
-                color: var(--text-secondary) !important;
-                background: transparent !important;
-                border: none !important;
-                padding: 4px 0 !important;
-            }
-            .workflow-status textarea {
-                background: transparent !important;
-                border: none !important;
-                color: var(--text-secondary) !important;
-                font-size: 11px !important;
-                min-height: 20px !important;
-            }
-
-            /* ===== 工作区标签页 ===== */
-            .work-tabs-header {
-                border-top: 1px solid var(--border-dark);
-                padding-top: 16px;
-                margin-top: 8px;
-            }
-            .work-tabs-header span {
-                color: var(--text-secondary);
-                font-size: 12px;
-                font-weight: 500;
-            }
-
-            /* ===== 标签页统一样式 ===== */
-            /* 主标签容器 */
-            .gradio-container .tabs {
-                width: 100% !important;
-                max-width: 100% !important;
-            }
-
-            /* 标签导航栏 */
-            .tabs > .tab-nav {
-                display: flex !important;
-                justify-content: flex-start !important;
-                gap: 4px !important;
-                background: var(--surface-dark) !important;
-                padding: 6px !important;
-                border-radius: 10px !important;
-                margin-bottom: 16px !important;
-                flex-wrap: wrap !important;
-            }
-
-            /* 标签按钮 - 统一宽度 */
-            .tabs > .tab-nav > button {
-                flex: 1 1 0 !important;
-                min-width: 0 !important;
-                padding: 10px 12px !important;
-                font-size: 13px !important;
-                font-weight: 500 !important;
-                border-radius: 6px !important;
-                background: transparent !important;
-                color: var(--text-secondary) !important;
-                border: none !important;
-                transition: all 0.2s !important;
-                text-align: center !important;
-                white-space: nowrap !important;
-            }
-
-            /* 标签悬停效果 */
-            .tabs > .tab-nav > button:hover {
-                background: var(--card-dark) !important;
-                color: white !important;
-            }
-
-            /* 激活标签样式 */
-            .tabs > .tab-nav > button.selected {
-                background: var(--primary) !important;
-                color: white !important;
-                box-shadow: 0 2px 8px rgba(19, 127, 236, 0.3) !important;
-            }
-
-            /* 标签内容区域 - 统一宽度和排版 */
-            .tabs > .tabitem {
-                width: 100% !important;
-                max-width: 100% !important;
-                min-height: 500px !important;
-                padding: 20px !important;
-                background: var(--panel-dark) !important;
-                border: 1px solid var(--border-dark) !important;
-                border-radius: 12px !important;
-                box-sizing: border-box !important;
-            }
-
-            /* 确保所有标签内容等宽 */
-            .tabs > .tabitem > * {
-                max-width: 100% !important;
-            }
-
-            /* 标签内的行元素 */
-            .tabs > .tabitem .row {
-                width: 100% !important;
-                margin: 0 !important;
-            }
-
-            /* 标签内的列元素 */
-            .tabs > .tabitem .column {
-                padding: 0 8px !important;
-            }
-
-            /* ===== 前序内容摘要卡片 ===== */
-            .step-summary {
-                background: linear-gradient(135deg, rgba(34, 197, 94, 0.1) 0%, var(--card-dark) 100%);
-                border: 1px solid rgba(34, 197, 94, 0.3);
-                border-radius: 10px;
-                padding: 12px 16px;
-                margin-bottom: 16px;
-            }
-            .step-summary-header {
-                display: flex;
-                justify-content: space-between;
-                align-items: center;
-                margin-bottom: 8px;
-            }
-            .step-summary-title {
-                color: #22c55e;
-                font-size: 12px;
-                font-weight: 600;
-            }
-            .step-summary-edit {
-                color: var(--primary);
-                font-size: 11px;
-                cursor: pointer;
-            }
-            .step-summary-content {
-                display: flex;
-                flex-wrap: wrap;
-                gap: 6px;
-            }
-            .step-summary-tag {
-                background: var(--surface-dark);
-                border: 1px solid var(--border-dark);
-                border-radius: 4px;
-                padding: 4px 8px;
-                font-size: 11px;
-                color: var(--text-secondary);
-            }
-            .step-summary-tag.char { border-left: 3px solid #60a5fa; }
-            .step-summary-tag.scene { border-left: 3px solid #c084fc; }
-            .step-summary-tag.shot { border-left: 3px solid #f59e0b; }
-            .step-summary-empty {
-                color: var(--text-secondary);
-                font-size: 11px;
-                font-style: italic;
-            }
-
-            /* ===== 镜头卡片 ===== */
-            .shot-card {
-                background: var(--panel-dark);
-                border: 1px solid var(--border-dark);
-                border-radius: 8px;
-                margin-bottom: 12px;
-                overflow: hidden;
-                transition: all 0.2s;
-            }
-            .shot-card:hover {
-                border-color: #3b526b;
-            }
-            .shot-card-indicator {
-                width: 4px;
-                position: absolute;
-                left: 0;
-                top: 0;
-                bottom: 0;
-            }
-            .shot-card-indicator.wide { background: #60a5fa; }
-            .shot-card-indicator.medium { background: #a78bfa; }
-            .shot-card-indicator.close { background: #818cf8; }
-
-            /* ===== Gradio 组件覆盖 ===== */
-            .gradio-container .block {
-                background: var(--panel-dark) !important;
-                border-color: var(--border-dark) !important;
-            }
-            .gradio-container input, .gradio-container textarea, .gradio-container select {
-                background: var(--bg-dark) !important;
-                border-color: var(--border-dark) !important;
-                color: var(--text-primary) !important;
-            }
-            .gradio-container input:focus, .gradio-container textarea:focus {
-                border-color: var(--primary) !important;
-                box-shadow: 0 0 0 2px rgba(19, 127, 236, 0.2) !important;
-            }
-            .gradio-container label {
-                color: var(--text-secondary) !important;
-            }
-            .gradio-container .prose, .gradio-container .markdown {
-                color: var(--text-primary) !important;
-            }
-            .gradio-container .prose h1, .gradio-container .prose h2, .gradio-container .prose h3 {
-                color: white !important;
-            }
-            .gradio-container .tabs {
-                background: transparent !important;
-                border-color: var(--border-dark) !important;
-            }
-            .gradio-container button.selected {
-                background: var(--primary) !important;
-                color: white !important;
-            }
-
-            /* ===== Radio 和 CheckboxGroup 选中状态 ===== */
-            /* Radio 组件 - 按钮式样式 */
-            .gradio-container .wrap label:has(input[type="radio"]),
-            .gradio-container form label:has(input[type="radio"]),
-            .gradio-container fieldset label:has(input[type="radio"]) {
-                display: inline-flex !important;
-                align-items: center !important;
-                padding: 10px 18px !important;
-                border-radius: 8px !important;
-                border: 1.5px solid var(--border-dark) !important;
-                background: var(--card-dark) !important;
-                color: var(--text-secondary) !important;
-                cursor: pointer !important;
-                transition: all 0.2s ease !important;
-                margin: 4px !important;
-                font-size: 14px !important;
-            }
-            .gradio-container .wrap label:has(input[type="radio"]):hover,
-            .gradio-container form label:has(input[type="radio"]):hover,
-            .gradio-container fieldset label:has(input[type="radio"]):hover {
-                border-color: var(--primary) !important;
-                background: rgba(19, 127, 236, 0.08) !important;
-                color: var(--text-primary) !important;
-            }
-            .gradio-container .wrap label:has(input[type="radio"]:checked),
-            .gradio-container form label:has(input[type="radio"]:checked),
-            .gradio-container fieldset label:has(input[type="radio"]:checked) {
-                background: var(--primary) !important;
-                border-color: var(--primary) !important;
-                color: white !important;
-                font-weight: 500 !important;
-                box-shadow: 0 2px 10px rgba(19, 127, 236, 0.35) !important;
-            }
-            /* 隐藏原生 radio 圆点 */
-            .gradio-container input[type="radio"] {
-                position: absolute !important;
-                opacity: 0 !important;
-                width: 0 !important;
-                height: 0 !important;
-            }
-
-            /* CheckboxGroup 组件 - 按钮式样式 (绿色) */
-            .gradio-container .wrap label:has(input[type="checkbox"]),
-            .gradio-container form label:has(input[type="checkbox"]),
-            .gradio-container fieldset label:has(input[type="checkbox"]) {
-                display: inline-flex !important;
-                align-items: center !important;
-                padding: 10px 18px !important;
-                border-radius: 8px !important;
-                border: 1.5px solid var(--border-dark) !important;
-                background: var(--card-dark) !important;
-                color: var(--text-secondary) !important;
-                cursor: pointer !important;
-                transition: all 0.2s ease !important;
-                margin: 4px !important;
-                font-size: 14px !important;
-            }
-            .gradio-container .wrap label:has(input[type="checkbox"]):hover,
-            .gradio-container form label:has(input[type="checkbox"]):hover,
-            .gradio-container fieldset label:has(input[type="checkbox"]):hover {
-                border-color: #22c55e !important;
-                background: rgba(34, 197, 94, 0.08) !important;
-                color: var(--text-primary) !important;
-            }
-            .gradio-container .wrap label:has(input[type="checkbox"]:checked),
-            .gradio-container form label:has(input[type="checkbox"]:checked),
-            .gradio-container fieldset label:has(input[type="checkbox"]:checked) {
-                background: #22c55e !important;
-                border-color: #22c55e !important;
-                color: white !important;
-                font-weight: 500 !important;
-                box-shadow: 0 2px 10px rgba(34, 197, 94, 0.35) !important;
-            }
-            /* 隐藏原生 checkbox */
-            .gradio-container .wrap input[type="checkbox"],
-            .gradio-container fieldset input[type="checkbox"] {
-                position: absolute !important;
-                opacity: 0 !important;
-                width: 0 !important;
-                height: 0 !important;
-            }
-
-            /* 单个 Checkbox 开关样式 (保留原生外观) */
-            .gradio-container .gr-check-radio label,
-            .gradio-container label.flex:has(input[name="checkbox"]) {
-                padding: 0 !important;
-                border: none !important;
-                background: transparent !important;
-                box-shadow: none !important;
-            }
-
-            /* 响应式 */
-            @media (max-width: 1200px) {
-                .workflow-grid { grid-template-columns: repeat(2, 1fr); }
-            }
-            @media (max-width: 768px) {
-                .workflow-grid { grid-template-columns: 1fr; }
-
-                /* 移动端优化 */
-                .gradio-container {
-                    padding: 8px !important;
-                }
-                .gradio-container .block {
-                    padding: 12px !important;
-                }
-                .app-header {
-                    flex-direction: column;
-                    gap: 8px;
-                    padding: 12px !important;
-                }
-                .app-header .logo h1 {
-                    font-size: 18px !important;
-                }
-
-                /* 按钮在移动端更大更易点击 */
-                .gradio-container button {
-                    min-height: 44px !important;
-                    font-size: 14px !important;
-                }
-
-                /* Row 在移动端变为纵向 */
-                .gradio-row {
-                    flex-direction: column !important;
-                }
-                .gradio-row > .gradio-column {
-                    min-width: 100% !important;
-                }
-
-                /* 预览图片在移动端全宽 */
-                .gradio-container .image-container {
-                    max-height: 300px !important;
-                }
-
-                /* 快速开始横幅移动端 */
-                .quick-start-banner {
-                    flex-direction: column;
-                    text-align: center;
-                    padding: 16px !important;
-                }
-
-                /* Tab 标签在移动端更紧凑 */
-                .gradio-container .tabs button {
-                    padding: 8px 12px !important;
-                    font-size: 13px !important;
-                }
-
-                /* 表单元素在移动端全宽 */
-                .gradio-container input,
-                .gradio-container textarea,
-                .gradio-container select {
-                    width: 100% !important;
-                }
-
-                /* Gallery 在移动端显示2列 */
-                .gradio-gallery {
-                    --columns: 2 !important;
-                }
-            }
-
-            @media (max-width: 480px) {
-                /* 更小屏幕的额外优化 */
-                .app-header .logo h1 {
-                    font-size: 16px !important;
-                }
-                .gradio-container h3 {
-                    font-size: 16px !important;
-                }
-                .gradio-container .tabs button {
-                    padding: 6px 8px !important;
-                    font-size: 12px !important;
-                }
-                /* Gallery 在小屏幕显示1列 */
-                .gradio-gallery {
-                    --columns: 1 !important;
-                }
-            }
-        </style>
-
-        <!-- 顶部导航栏 -->
-        <div class="app-header">
-            <div class="logo">
-                <div class="logo-icon">🎬</div>
-                <h1>AI 分镜 Pro</h1>
-            </div>
-            <div class="status-pill">
-                <div class="status-dot"></div>
-                <span>系统运行中</span>
-            </div>
-        </div>
-
-        <!-- 全局镜头预览弹窗 -->
-        <div id="globalShotModal" class="shot-modal-global" style="display:none;">
-            <div class="shot-modal-content">
-                <div class="shot-modal-header">
-                    <span id="globalModalTitle">镜头预览</span>
-                    <button class="shot-modal-close" onclick="window.closeGlobalModal()">&times;</button>
-                </div>
-                <div class="shot-modal-body">
-                    <div class="shot-modal-image-container">
-                        <div id="globalModalImage"></div>
-                    </div>
-                    <div class="shot-modal-info">
-                        <div class="info-section">
-                            <div class="info-label">镜头描述</div>
-                            <div id="globalModalDesc" class="info-value"></div>
-                        </div>
-                        <div class="info-row">
-                            <div class="info-item"><span class="info-label">角色</span><span id="globalModalChars" class="info-value"></span></div>
-                            <div class="info-item"><span class="info-label">场景</span><span id="globalModalScene" class="info-value"></span></div>
-                        </div>
-                        <div class="info-row">
-                            <div class="info-item"><span class="info-label">景别</span><span id="globalModalType" class="info-value"></span></div>
-                            <div class="info-item"><span class="info-label">镜头角度</span><span id="globalModalAngle" class="info-value"></span></div>
-                        </div>
-                        <div class="info-section">
-                            <div class="info-label">生成提示词</div>
-                            <div id="globalModalPrompt" class="info-value prompt-text"></div>
-                        </div>
-                    </div>
-                </div>
-                <div class="shot-modal-nav">
-                    <button class="nav-btn" onclick="window.navigateGlobalShot(-1)">◀ 上一个</button>
-                    <span id="globalModalNav">1 / 7</span>
-                    <button class="nav-btn" onclick="window.navigateGlobalShot(1)">下一个 ▶</button>
-                </div>
-            </div>
-        </div>
-
-        <!-- 全局视频预览弹窗 -->
-        <div id="globalVideoModal" class="video-modal-global" style="display:none;">
-            <div class="video-modal-content">
-                <div class="video-modal-header">
-                    <span id="videoModalTitle">视频预览</span>
-                    <button class="video-modal-close" onclick="window.closeVideoModal()">&times;</button>
-                </div>
-                <div class="video-modal-body">
-                    <div class="video-modal-player">
-                        <video id="videoModalPlayer" controls autoplay style="width:100%; max-height:60vh; background:#000;">
-                            您的浏览器不支持视频播放
-                        </video>
-                    </div>
-                    <div class="video-modal-info">
-                        <div class="info-section">
-                            <div class="info-label">生成提示词</div>
-                            <div id="videoModalPrompt" class="info-value prompt-text"></div>
-                        </div>
-                    </div>
-                </div>
-                <div class="video-modal-nav">
-                    <button class="nav-btn" onclick="window.navigateVideo(-1)">◀ 上一个</button>
-                    <span id="videoModalNav">1 / 7</span>
-                    <button class="nav-btn" onclick="window.navigateVideo(1)">下一个 ▶</button>
-                </div>
-            </div>
-        </div>
-
-        <!-- JavaScript 已移至 gr.Blocks(js=...) 参数中 -->
-
-        <style>
-            /* 视频弹窗样式 */
-            .video-modal-global {
-                position: fixed;
-                top: 0;
-                left: 0;
-                width: 100%;
-                height: 100%;
-                background: rgba(0, 0, 0, 0.95);
-                z-index: 99999;
-                display: flex;
-                justify-content: center;
-                align-items: center;
-                padding: 20px;
-            }
-            .video-modal-global .video-modal-content {
-                background: #1a1a2e;
-                border-radius: 12px;
-                max-width: 900px;
-                width: 100%;
-                max-height: 90vh;
-                overflow: hidden;
-                display: flex;
-                flex-direction: column;
-                box-shadow: 0 20px 60px rgba(0, 0, 0, 0.5);
-            }
-            .video-modal-global .video-modal-header {
-                display: flex;
-                justify-content: space-between;
-                align-items: center;
-                padding: 16px 20px;
-                border-bottom: 1px solid #333;
-            }
-            .video-modal-global .video-modal-header span {
-                font-size: 18px;
-                font-weight: 600;
-                color: #a78bfa;
-            }
-            .video-modal-global .video-modal-close {
-                background: none;
-                border: none;
-                color: #888;
-                font-size: 28px;
-                cursor: pointer;
-            }
-            .video-modal-global .video-modal-close:hover { color: #fff; }
-            .video-modal-global .video-modal-body {
-                display: flex;
-                flex-direction: column;
-                flex: 1;
-                overflow: hidden;
-            }
-            .video-modal-global .video-modal-player {
-                background: #000;
-                display: flex;
-                align-items: center;
-                justify-content: center;
-                min-height: 300px;
-            }
-            .video-modal-global .video-modal-info {
-                padding: 16px 20px;
-                background: #16202a;
-                max-height: 150px;
-                overflow-y: auto;
-            }
-            .video-modal-global .info-section {
-                margin-bottom: 12px;
-            }
-            .video-modal-global .info-label {
-                font-size: 12px;
-                color: #a78bfa;
-                margin-bottom: 4px;
-                font-weight: 600;
-            }
-            .video-modal-global .info-value {
-                font-size: 13px;
-                color: #e2e8f0;
-                line-height: 1.5;
-            }
-            .video-modal-global .prompt-text {
-                font-family: monospace;
-                font-size: 11px;
-                color: #9ca3af;
-                white-space: pre-wrap;
-                word-break: break-all;
-            }
-            .video-modal-global .video-modal-nav {
-                display: flex;
-                justify-content: center;
-                align-items: center;
-                gap: 20px;
-                padding: 12px 20px;
-                border-top: 1px solid #333;
-                background: #1a1a2e;
-            }
-            .video-modal-global .nav-btn {
-                background: #7c3aed;
-                border: none;
-                color: white;
-                padding: 8px 16px;
-                border-radius: 6px;
-                cursor: pointer;
-                font-size: 13px;
-            }
-            .video-modal-global .nav-btn:hover {
-                background: #6d28d9;
-            }
-            .video-modal-global #videoModalNav {
-                color: #9ca3af;
-                font-size: 13px;
-            }
-
-            .shot-modal-global {
-                position: fixed;
-                top: 0;
-                left: 0;
-                width: 100%;
-                height: 100%;
-                background: rgba(0, 0, 0, 0.9);
-                z-index: 99999;
-                justify-content: center;
-                align-items: center;
-                padding: 20px;
-            }
-            .shot-modal-global .shot-modal-content {
-                background: #1a1a2e;
-                border-radius: 12px;
-                max-width: 900px;
-                width: 100%;
-                max-height: 90vh;
-                overflow: hidden;
-                display: flex;
-                flex-direction: column;
-                box-shadow: 0 20px 60px rgba(0, 0, 0, 0.5);
-            }
-            .shot-modal-global .shot-modal-header {
-                display: flex;
-                justify-content: space-between;
-                align-items: center;
-                padding: 16px 20px;
-                border-bottom: 1px solid #333;
-            }
-            .shot-modal-global .shot-modal-header span {
-                font-size: 18px;
-                font-weight: 600;
-                color: #fff;
-            }
-            .shot-modal-global .shot-modal-close {
-                background: none;
-                border: none;
-                color: #888;
-                font-size: 28px;
-                cursor: pointer;
-            }
-            .shot-modal-global .shot-modal-close:hover { color: #fff; }
-            .shot-modal-global .shot-modal-body {
-                display: flex;
-                flex: 1;
-                overflow: hidden;
-            }
-            .shot-modal-global .shot-modal-image-container {
-                flex: 1;
-                background: #0a0a15;
-                display: flex;
-                align-items: center;
-                justify-content: center;
-                min-height: 300px;
-            }
-            .shot-modal-global .modal-preview-img {
-                max-width: 100%;
-                max-height: 60vh;
-                object-fit: contain;
-            }
-            .shot-modal-global .modal-no-image {
-                color: #666;
-                font-size: 24px;
-                text-align: center;
-            }
-            .shot-modal-global .shot-modal-info {
-                width: 300px;
-                padding: 20px;
-                overflow-y: auto;
-                border-left: 1px solid #333;
-                background: #12121f;
-            }
-            .shot-modal-global .info-section { margin-bottom: 16px; }
-            .shot-modal-global .info-row { display: flex; gap: 16px; margin-bottom: 12px; }
-            .shot-modal-global .info-item { flex: 1; }
-            .shot-modal-global .info-label { font-size: 11px; color: #666; margin-bottom: 4px; text-transform: uppercase; }
-            .shot-modal-global .info-value { font-size: 13px; color: #e0e0e0; line-height: 1.5; }
-            .shot-modal-global .prompt-text { font-size: 12px; color: #888; background: #0a0a15; padding: 10px; border-radius: 6px; max-height: 100px; overflow-y: auto; }
-            .shot-modal-global .shot-modal-nav {
-                display: flex;
-                justify-content: space-between;
-                align-items: center;
-                padding: 12px 20px;
-                border-top: 1px solid #333;
-                background: #12121f;
-            }
-            .shot-modal-global .nav-btn {
-                background: #2a2a3e;
-                border: none;
-                color: #fff;
-                padding: 8px 16px;
-                border-radius: 6px;
-                cursor: pointer;
-            }
-            .shot-modal-global .nav-btn:hover { background: #3a3a4e; }
-            @media (max-width: 768px) {
-                .shot-modal-global .shot-modal-body { flex-direction: column; }
-                .shot-modal-global .shot-modal-info { width: 100%; border-left: none; border-top: 1px solid #333; }
-            }
-        </style>
-        """)
+        gr.HTML(APP_HEADER_HTML)
 
         # ===== 主布局：左侧内容 + 右侧面板 =====
         with gr.Row(equal_height=False):
 
             # ===== 左侧：主工作区 (80%) =====
-            with gr.Column(scale=4):
+            # dai-sidebar-* 类供三栏布局样式直接定位，避免深层后代选择器
+            with gr.Column(scale=4, elem_classes="dai-sidebar-col dai-sidebar-left"):
 
                 # 项目状态概览 (可见，显示加载的范例内容)
                 project_summary = gr.HTML(value=get_project_summary(), elem_classes="project-summary-card")
 
                 # ===== 新手快速开始区域 =====
-                gr.HTML("""
-                <div class="quick-start-banner">
-                    <div class="qs-icon">🚀</div>
-                    <div class="qs-content">
-                        <h3>新手？一键开始体验</h3>
-                        <p>点击下方任意范例模板，立即加载完整的角色、场景和镜头数据，快速了解系统工作流程。</p>
-                    </div>
-                </div>
-                <style>
-                    .quick-start-banner {
-                        background: linear-gradient(135deg, rgba(34, 197, 94, 0.15) 0%, rgba(16, 25, 34, 0.95) 100%);
-                        border: 1px solid rgba(34, 197, 94, 0.3);
-                        border-radius: 12px;
-                        padding: 20px 24px;
-                        margin-bottom: 20px;
-                        display: flex;
-                        align-items: center;
-                        gap: 16px;
-                    }
-                    .quick-start-banner .qs-icon {
-                        font-size: 32px;
-                        background: rgba(34, 197, 94, 0.2);
-                        padding: 12px;
-                        border-radius: 12px;
-                    }
-                    .quick-start-banner h3 {
-                        color: #22c55e;
-                        font-size: 16px;
-                        font-weight: 600;
-                        margin: 0 0 4px 0;
-                    }
-                    .quick-start-banner p {
-                        color: var(--text-secondary);
-                        font-size: 13px;
-                        margin: 0;
-                    }
-                </style>
-                """)
+                gr.HTML(QUICK_START_HTML)
 
                 # ===== 一句话生成故事 =====
                 with gr.Group(elem_classes="ai-story-generator"):
-                    gr.HTML("""
-                    <div class="ai-gen-header">
-                        <span class="ai-icon">✨</span>
-                        <div>
-                            <h4>一句话生成故事</h4>
-                            <p>输入你的创意，AI 自动生成完整的角色、场景和分镜</p>
-                        </div>
-                    </div>
-                    <style>
-                        .ai-story-generator {
-                            background: linear-gradient(135deg, rgba(139, 92, 246, 0.15) 0%, rgba(16, 25, 34, 0.95) 100%);
-                            border: 1px solid rgba(139, 92, 246, 0.3);
-                            border-radius: 12px;
-                            padding: 16px;
-                            margin-bottom: 20px;
-                        }
-                        .ai-gen-header {
-                            display: flex;
-                            align-items: center;
-                            gap: 12px;
-                            margin-bottom: 12px;
-                        }
-                        .ai-gen-header .ai-icon {
-                            font-size: 28px;
-                            background: rgba(139, 92, 246, 0.2);
-                            padding: 10px;
-                            border-radius: 10px;
-                        }
-                        .ai-gen-header h4 {
-                            color: #a78bfa;
-                            font-size: 15px;
-                            font-weight: 600;
-                            margin: 0 0 2px 0;
-                        }
-                        .ai-gen-header p {
-                            color: var(--text-secondary);
-                            font-size: 12px;
-                            margin: 0;
-                        }
-                    </style>
-                    """)
+                    gr.HTML(AI_STORY_HEADER_HTML)
                     with gr.Row():
                         story_idea_input = gr.Textbox(
                             label="",
@@ -5591,7 +4517,6 @@ def create_ui():
                             container=False
                         )
                         generate_story_btn = gr.Button("🚀 AI 生成", variant="primary", scale=1, min_width=100)
-                    story_gen_status = gr.Textbox(label="", show_label=False, interactive=False, container=False, visible=False)
 
                 # ===== 范例模板（推荐新手使用）=====
                 gr.HTML('<div class="templates-section"><h3>📦 选择一个范例开始 <span style="font-size:12px;color:#22c55e;font-weight:normal;">推荐新手</span></h3></div>')
@@ -5599,221 +4524,40 @@ def create_ui():
                 with gr.Row():
                     # 模板卡片 - 马到成功送祝福
                     with gr.Column(scale=1):
-                        gr.HTML("""
-                        <div class="template-card featured" id="template-madao" onclick="document.getElementById('load-madao')?.click()">
-                            <div class="info">
-                                <span class="badge drama">🐴 送福</span>
-                                <h4>🎊 马到成功送祝福</h4>
-                                <p>马年吉祥物小骏马送福上门的欢乐故事</p>
-                                <span class="meta">3 角色 • 2 场景 • 7 镜头</span>
-                            </div>
-                        </div>
-                        """)
-                        load_madao_btn = gr.Button("✨ 加载此范例", size="sm", variant="primary", elem_id="load-madao")
+                        gr.HTML(TEMPLATE_CARDS_HTML["madao"])
 
                     # 模板卡片 - 骏马奔腾迎新年
-                    with gr.Column(scale=1):
-                        gr.HTML("""
-                        <div class="template-card" id="template-junma" onclick="document.getElementById('load-junma')?.click()">
-                            <div class="info">
-                                <span class="badge action">🏠 团圆</span>
-                                <h4>🎆 骏马奔腾迎新年</h4>
-                                <p>马家大院除夕团圆，龙马精神迎新春</p>
-                                <span class="meta">5 角色 • 2 场景 • 7 镜头</span>
-                            </div>
-                        </div>
-                        """)
-                        load_junma_btn = gr.Button("加载此范例", size="sm", variant="secondary", elem_id="load-junma")
-
-                    # 模板卡片 - 马上有美食
-                    with gr.Column(scale=1):
-                        gr.HTML("""
-                        <div class="template-card" id="template-mashang" onclick="document.getElementById('load-mashang')?.click()">
-                            <div class="info">
-                                <span class="badge drama">🍜 美食</span>
-                                <h4>🥟 马上有美食</h4>
-                                <p>马蹄糕马卡龙，马年特色美食大展示</p>
-                                <span class="meta">3 角色 • 2 场景 • 8 镜头</span>
-                            </div>
-                        </div>
-                        """)
-                        load_mashang_btn = gr.Button("加载此范例", size="sm", variant="secondary", elem_id="load-mashang")
-
-                # ===== 工作流程指引（步骤说明）=====
-                gr.HTML("""
-                <div class="workflow-guide">
-                    <h3>📋 工作流程（4个步骤）</h3>
-                    <p class="guide-desc">加载范例后，按顺序完成以下步骤即可生成分镜作品</p>
-                    <div class="steps-container">
-                        <div class="step-item">
-                            <div class="step-num">1</div>
-                            <div class="step-info">
-                                <h4>创建</h4>
-                                <p>添加角色和场景</p>
-                            </div>
-                            <div class="step-arrow">→</div>
-                        </div>
-                        <div class="step-item">
-                            <div class="step-num">2</div>
-                            <div class="step-info">
-                                <h4>编排</h4>
-                                <p>设计镜头顺序</p>
-                            </div>
-                            <div class="step-arrow">→</div>
-                        </div>
-                        <div class="step-item">
-                            <div class="step-num">3</div>
-                            <div class="step-info">
-                                <h4>生成</h4>
-                                <p>AI 生成图像</p>
-                            </div>
-                            <div class="step-arrow">→</div>
-                        </div>
-                        <div class="step-item last">
-                            <div class="step-num done">4</div>
-                            <div class="step-info">
-                                <h4>导出</h4>
-                                <p>下载成品</p>
-                            </div>
-                        </div>
-                    </div>
-                </div>
-                <style>
-                    .workflow-guide {
-                        background: var(--card-dark);
-                        border: 1px solid var(--border-dark);
-                        border-radius: 12px;
-                        padding: 16px 20px;
-                        margin: 12px 0 4px 0;
-                    }
-                    .workflow-guide h3 {
-                        color: white;
-                        font-size: 15px;
-                        font-weight: 600;
-                        margin: 0 0 4px 0;
-                    }
-                    .workflow-guide .guide-desc {
-                        color: var(--text-secondary);
-                        font-size: 12px;
-                        margin: 0 0 16px 0;
-                    }
-                    .steps-container {
-                        display: flex;
-                        align-items: center;
-                        gap: 8px;
-                    }
-                    .step-item {
-                        display: flex;
-                        align-items: center;
-                        gap: 12px;
-                        flex: 1;
-                        background: var(--surface-dark);
-                        padding: 12px 16px;
-                        border-radius: 8px;
-                        border: 1px solid var(--border-dark);
-                    }
-                    .step-item.last { flex: 0.8; }
-                    .step-num {
-                        width: 28px;
-                        height: 28px;
-                        background: var(--primary);
-                        border-radius: 50%;
-                        display: flex;
-                        align-items: center;
-                        justify-content: center;
-                        color: white;
-                        font-size: 13px;
-                        font-weight: 700;
-                        flex-shrink: 0;
-                    }
-                    .step-num.done { background: #22c55e; }
-                    .step-info h4 {
-                        color: white;
-                        font-size: 13px;
-                        font-weight: 600;
-                        margin: 0;
-                    }
-                    .step-info p {
-                        color: var(--text-secondary);
-                        font-size: 11px;
-                        margin: 0;
-                    }
-                    .step-arrow {
-                        color: var(--text-secondary);
-                        font-size: 16px;
-                        margin-left: auto;
-                    }
-                    .step-item.last .step-arrow { display: none; }
-
-                    /* 工作流导航按钮 */
-                    .workflow-nav-buttons {
-                        margin: 8px 0 0 0 !important;
-                        gap: 8px !important;
-                    }
-                    .workflow-nav-buttons button {
-                        flex: 1;
-                        padding: 8px 12px !important;
-                        font-size: 12px !important;
-                        background: var(--card-dark) !important;
-                        border: 1px solid var(--border-dark) !important;
-                        color: var(--text-secondary) !important;
-                        border-radius: 6px !important;
-                    }
-                    .workflow-nav-buttons button:hover {
-                        background: var(--primary) !important;
-                        border-color: var(--primary) !important;
-                        color: white !important;
-                    }
+                    with gr.Column(scale=1):
+                        gr.HTML(TEMPLATE_CARDS_HTML["junma"])
 
-                    .template-card.featured {
-                        border-color: rgba(34, 197, 94, 0.4);
-                        box-shadow: 0 0 20px rgba(34, 197, 94, 0.1);
-                    }
-                    .template-card.selected {
-                        border-color: #137fec !important;
-                        box-shadow: 0 0 0 2px rgba(19, 127, 236, 0.3), 0 4px 20px rgba(19, 127, 236, 0.2) !important;
-                        background: linear-gradient(135deg, rgba(19, 127, 236, 0.1) 0%, var(--card-dark) 100%) !important;
-                    }
-                    .template-card.selected::after {
-                        content: '✓ 已加载';
-                        position: absolute;
-                        top: 8px;
-                        right: 8px;
-                        background: #137fec;
-                        color: white;
-                        padding: 2px 8px;
-                        border-radius: 4px;
-                        font-size: 10px;
-                        font-weight: 600;
-                    }
-                </style>
-                """)
+                    # 模板卡片 - 马上有美食
+                    with gr.Column(scale=1):
+                        gr.HTML(TEMPLATE_CARDS_HTML["mashang"])
+
+                # ===== 工作流程指引（步骤说明）=====
+                gr.HTML(WORKFLOW_GUIDE_HTML)
 
                 # 快速导航按钮
-                with gr.Row(elem_classes="workflow-nav-buttons"):
-                    nav_create_btn = gr.Button("① 创建角色/场景", size="sm", elem_id="nav-create")
-                    nav_arrange_btn = gr.Button("② 编排镜头", size="sm", elem_id="nav-arrange")
-                    nav_generate_btn = gr.Button("③ 生成图像", size="sm", elem_id="nav-generate")
-                    nav_export_btn = gr.Button("④ 导出作品", size="sm", elem_id="nav-export")
+                with gr.Row():
+                    gr.HTML(WORKFLOW_NAV_HTML)
 
                 # 隐藏旧按钮（保留事件绑定）
                 with gr.Row(visible=False):
                     new_project_btn = gr.Button("新建项目")
                     load_template_btn = gr.Button("加载范例")
 
-                # 隐藏的范例选择器(保留功能)
+                # 范例加载结果（隐藏，仅作为模板加载的输出）
                 with gr.Row(visible=False):
-                    example_choice = gr.Radio(
-                        choices=list(EXAMPLE_STORIES.keys()),
-                        label="范例故事",
-                        value=None
-                    )
-                    load_example_btn = gr.Button("🚀 加载范例", variant="primary", size="sm", elem_id="load-example-btn")
-                    example_status = gr.Textbox(label="", show_label=False, interactive=False, container=False)
+                    example_status = gr.Markdown("")
                     example_desc = gr.Textbox(label="说明", interactive=False, lines=2)
 
+                # 隐藏元素：范例卡片点击触发 (使用CSS隐藏以保持JavaScript可交互)
+                with gr.Row(elem_classes="hidden-trigger-row"):
+                    template_action_key = gr.Textbox(value="", elem_id="template_action_key")
+                    template_action_btn = gr.Button("加载范例", elem_id="template_action_btn")
+
             # ===== 右侧：设置面板 (20%) =====
-            with gr.Column(scale=1, min_width=280):
+            with gr.Column(scale=1, min_width=280, elem_classes="dai-sidebar-col dai-sidebar-right"):
 
                 # ComfyUI 连接状态
                 with gr.Group(elem_classes="comfyui-status-container"):
@@ -5823,109 +4567,156 @@ def create_ui():
                     with gr.Row():
                         comfyui_connect_btn = gr.Button("🔌 连接", size="sm", scale=1, elem_classes="comfyui-connect-btn")
                         comfyui_refresh_btn = gr.Button("🔄", size="sm", scale=0, min_width=40)
-                    comfyui_msg = gr.Textbox(label="", show_label=False, interactive=False, container=False, visible=False)
+                    comfyui_msg = gr.Markdown("", visible=False, elem_classes="inline-status")
 
                 gr.HTML('<div class="section-title">⚙️ AI 引擎设置</div>')
 
+                # API 地址和国际服务商字段不在界面上展示，统一由 api_compat_state 提供
+                api_compat_state = gr.State(dict(API_COMPAT_DEFAULTS))
+
+                # 以下三个设置面板默认折叠，内容在首次展开时才渲染（key 保证再次展开时保留已填写的值）
+                # 保存配置只是写入内存中的 API_CONFIG，直接处理不进入队列
+
                 # LLM 设置
-                with gr.Accordion("🤖 语言模型", open=False):
-                    llm_provider_cn = gr.Radio(
-                        ["Claude Code CLI (默认)", "DeepSeek", "智谱 GLM", "通义千问", "OpenAI GPT"],
-                        label="",
-                        value="Claude Code CLI (默认)",
-                        container=False
-                    )
-                    llm_api_key_cn = gr.Textbox(
-                        label="API Key (CLI 模式无需填写)",
-                        placeholder="使用 CLI 无需 API Key",
-                        type="password"
-                    )
-                    llm_api_url_cn = gr.Textbox(
-                        label="API 地址",
-                        placeholder="留空使用默认",
-                        value="",
-                        visible=False
-                    )
-                    # 隐藏的国际服务商字段
-                    llm_provider_intl = gr.Textbox(visible=False, value="")
-                    llm_api_key_intl = gr.Textbox(visible=False, value="")
-                    llm_api_url_intl = gr.Textbox(visible=False, value="")
-                    llm_save_btn = gr.Button("保存配置", elem_classes="primary-btn", size="sm")
-                    llm_save_status = gr.Textbox(label="", show_label=False, interactive=False, container=False)
+                with gr.Accordion("🤖 语言模型", open=False) as llm_accordion:
+                    @gr.render(triggers=[llm_accordion.expand])
+                    def render_llm_settings():
+                        llm_provider_cn = gr.Dropdown(
+                            ["Claude Code CLI (默认)", "DeepSeek", "智谱 GLM", "通义千问", "OpenAI GPT"],
+                            label="",
+                            value="Claude Code CLI (默认)",
+                            container=False,
+                            filterable=False,
+                            key="llm_provider_cn"
+                        )
+                        llm_api_key_cn = gr.Textbox(
+                            label="API Key (CLI 模式无需填写)",
+                            placeholder="使用 CLI 无需 API Key",
+                            type="password",
+                            key="llm_api_key_cn"
+                        )
+                        llm_save_btn = gr.Button("保存配置", elem_classes="primary-btn", size="sm", key="llm_save_btn")
+                        llm_save_status = gr.Markdown("", elem_classes="inline-status", key="llm_save_status")
+
+                        llm_save_btn.click(
+                            lambda provider, api_key, compat: save_llm_config(provider, api_key, **compat),
+                            inputs=[llm_provider_cn, llm_api_key_cn, api_compat_state],
+                            outputs=[llm_save_status],
+                            queue=False
+                        )
 
                 # 图像生成配置 - 简化版
-                with gr.Accordion("🎨 图像生成", open=False):
-                    img_provider_cn = gr.Radio(
-                        ["本地 ComfyUI (默认)", "通义万相", "智谱 CogView", "Stability AI"],
-                        label="选择引擎",
-                        value="本地 ComfyUI (默认)"
-                    )
-                    img_api_key_cn = gr.Textbox(
-                        label="API Key",
-                        placeholder="ComfyUI 无需 API Key",
-                        type="password"
-                    )
+                with gr.Accordion("🎨 图像生成", open=False) as img_accordion:
+                    @gr.render(triggers=[img_accordion.expand])
+                    def render_image_settings():
+                        img_provider_cn = gr.Dropdown(
+                            ["本地 ComfyUI (默认)", "通义万相", "智谱 CogView", "Stability AI"],
+                            label="选择引擎",
+                            value="本地 ComfyUI (默认)",
+                            filterable=False,
+                            key="img_provider_cn"
+                        )
+                        img_api_key_cn = gr.Textbox(
+                            label="API Key",
+                            placeholder="ComfyUI 无需 API Key",
+                            type="password",
+                            key="img_api_key_cn"
+                        )
 
-                    # ComfyUI 工作流设置
-                    gr.Markdown("**ComfyUI 工作流**", elem_classes="workflow-label")
-                    with gr.Row():
-                        load_default_workflow_btn = gr.Button(
-                            "📦 加载默认流",
-                            size="sm",
-                            variant="primary",
-                            scale=1
+                        # ComfyUI 工作流设置
+                        gr.Markdown("**ComfyUI 工作流**", elem_classes="workflow-label", key="img_workflow_label")
+                        with gr.Row(key="img_workflow_row"):
+                            load_default_workflow_btn = gr.Button(
+                                "📦 加载默认流",
+                                size="sm",
+                                variant="primary",
+                                scale=1,
+                                key="load_default_workflow_btn"
+                            )
+                            load_custom_workflow_btn = gr.Button(
+                                "📁 加载自定义",
+                                size="sm",
+                                variant="secondary",
+                                scale=1,
+                                key="load_custom_workflow_btn"
+                            )
+                        img_workflow_file = gr.File(
+                            label="上传工作流 (JSON)",
+                            file_types=[".json"],
+                            type="filepath",
+                            visible=False,
+                            key="img_workflow_file"
                         )
-                        load_custom_workflow_btn = gr.Button(
-                            "📁 加载自定义",
-                            size="sm",
-                            variant="secondary",
-                            scale=1
+                        workflow_status = gr.Markdown(
+                            "未加载工作流",
+                            elem_classes="workflow-status",
+                            key="workflow_status"
+                        )
+
+                        img_save_btn = gr.Button("保存配置", elem_classes="primary-btn", size="sm", key="img_save_btn")
+                        img_save_status = gr.Markdown("", elem_classes="inline-status", key="img_save_status")
+
+                        img_save_btn.click(
+                            lambda provider, api_key, compat: save_image_config(provider, api_key, **compat),
+                            inputs=[img_provider_cn, img_api_key_cn, api_compat_state],
+                            outputs=[img_save_status],
+                            queue=False
+                        )
+
+                        # ComfyUI 工作流加载
+                        load_default_workflow_btn.click(
+                            load_default_workflow,
+                            outputs=[workflow_status]
+                        )
+
+                        # 点击自定义按钮显示文件上传
+                        load_custom_workflow_btn.click(
+                            lambda: gr.update(visible=True),
+                            outputs=[img_workflow_file]
                         )
-                    img_workflow_file = gr.File(
-                        label="上传工作流 (JSON)",
-                        file_types=[".json"],
-                        type="filepath",
-                        visible=False
-                    )
-                    workflow_status = gr.Textbox(
-                        label="",
-                        show_label=False,
-                        interactive=False,
-                        container=False,
-                        value="未加载工作流",
-                        elem_classes="workflow-status"
-                    )
 
-                    img_api_url_cn = gr.Textbox(visible=False, value="")
-                    img_provider_intl = gr.Textbox(visible=False, value="")
-                    img_api_key_intl = gr.Textbox(visible=False, value="")
-                    img_api_url_intl = gr.Textbox(visible=False, value="")
-                    img_save_btn = gr.Button("保存配置", elem_classes="primary-btn", size="sm")
-                    img_save_status = gr.Textbox(label="", show_label=False, interactive=False, container=False)
+                        # 上传文件后加载工作流
+                        img_workflow_file.change(
+                            load_workflow_from_file,
+                            inputs=[img_workflow_file],
+                            outputs=[workflow_status]
+                        ).then(
+                            lambda: gr.update(visible=False),
+                            outputs=[img_workflow_file]
+                        )
 
                 # 视频生成配置 - 简化版
-                with gr.Accordion("🎬 视频生成", open=False):
-                    video_provider_cn = gr.Radio(
-                        ["本地 ComfyUI (默认)", "智谱 CogVideoX", "可灵 AI", "Runway"],
-                        label="选择引擎",
-                        value="本地 ComfyUI (默认)"
-                    )
-                    video_api_key_cn = gr.Textbox(
-                        label="API Key",
-                        placeholder="ComfyUI 无需 API Key",
-                        type="password"
-                    )
-                    video_workflow_file = gr.File(
-                        label="ComfyUI 工作流 (JSON)",
-                        file_types=[".json"],
-                        type="filepath"
-                    )
-                    video_api_url_cn = gr.Textbox(visible=False, value="")
-                    video_provider_intl = gr.Textbox(visible=False, value="")
-                    video_api_key_intl = gr.Textbox(visible=False, value="")
-                    video_api_url_intl = gr.Textbox(visible=False, value="")
-                    video_save_btn = gr.Button("保存配置", elem_classes="primary-btn", size="sm")
-                    video_save_status = gr.Textbox(label="", show_label=False, interactive=False, container=False)
+                with gr.Accordion("🎬 视频生成", open=False) as video_accordion:
+                    @gr.render(triggers=[video_accordion.expand])
+                    def render_video_settings():
+                        video_provider_cn = gr.Dropdown(
+                            ["本地 ComfyUI (默认)", "智谱 CogVideoX", "可灵 AI", "Runway"],
+                            label="选择引擎",
+                            value="本地 ComfyUI (默认)",
+                            filterable=False,
+                            key="video_provider_cn"
+                        )
+                        video_api_key_cn = gr.Textbox(
+                            label="API Key",
+                            placeholder="ComfyUI 无需 API Key",
+                            type="password",
+                            key="video_api_key_cn"
+                        )
+                        gr.File(
+                            label="ComfyUI 工作流 (JSON)",
+                            file_types=[".json"],
+                            type="filepath",
+                            key="video_workflow_file"
+                        )
+                        video_save_btn = gr.Button("保存配置", elem_classes="primary-btn", size="sm", key="video_save_btn")
+                        video_save_status = gr.Markdown("", elem_classes="inline-status", key="video_save_status")
+
+                        video_save_btn.click(
+                            lambda provider, api_key, compat: save_video_config(provider, api_key, **compat),
+                            inputs=[video_provider_cn, video_api_key_cn, api_compat_state],
+                            outputs=[video_save_status],
+                            queue=False
+                        )
 
                 # ===== CLI 实时反馈窗口 =====
                 gr.HTML("""
@@ -5954,445 +4745,7 @@ def create_ui():
                     refresh_cli_btn = gr.Button("🔄 刷新", size="sm", scale=1, variant="secondary")
                     clear_cli_btn = gr.Button("🗑️ 清空", size="sm", scale=1, variant="secondary")
 
-        # ===== 工作流进度指示器样式 =====
-        gr.HTML("""
-        <style>
-            /* ===== 工作流进度指示器 (紧凑版) ===== */
-            .workflow-progress {
-                background: var(--card-dark);
-                border: 1px solid var(--border-dark);
-                border-radius: 8px;
-                padding: 8px 12px;
-                margin-bottom: 12px;
-            }
-            .workflow-progress-header {
-                display: flex;
-                justify-content: space-between;
-                align-items: center;
-                margin-bottom: 6px;
-            }
-            .workflow-progress-title {
-                color: white;
-                font-size: 12px;
-                font-weight: 600;
-            }
-            .workflow-progress-status {
-                color: #22c55e;
-                font-size: 11px;
-                font-weight: 500;
-            }
-            .workflow-steps {
-                display: flex;
-                gap: 4px;
-            }
-            .workflow-step {
-                flex: 1;
-                display: flex;
-                align-items: center;
-                gap: 4px;
-                padding: 6px 8px;
-                background: var(--surface-dark);
-                border: 2px solid var(--border-dark);
-                border-radius: 6px;
-                cursor: pointer;
-                transition: all 0.3s;
-            }
-            .workflow-step:hover {
-                border-color: var(--primary);
-            }
-            .workflow-step.completed {
-                border-color: #22c55e;
-                background: rgba(34, 197, 94, 0.1);
-            }
-            .workflow-step.current {
-                border-color: var(--primary);
-                background: rgba(19, 127, 236, 0.15);
-                box-shadow: 0 0 0 3px rgba(19, 127, 236, 0.2);
-            }
-            .workflow-step.current::before {
-                content: '';
-                position: absolute;
-                top: -2px;
-                left: -2px;
-                right: -2px;
-                bottom: -2px;
-                border-radius: 10px;
-                background: linear-gradient(90deg, var(--primary), #60a5fa);
-                animation: pulse-border 2s infinite;
-                z-index: -1;
-            }
-            @keyframes pulse-border {
-                0%, 100% { opacity: 0.5; }
-                50% { opacity: 1; }
-            }
-            .workflow-step .step-icon {
-                width: 20px;
-                height: 20px;
-                border-radius: 50%;
-                display: flex;
-                align-items: center;
-                justify-content: center;
-                font-size: 11px;
-                font-weight: 700;
-                background: var(--border-dark);
-                color: var(--text-secondary);
-                flex-shrink: 0;
-            }
-            .workflow-step.completed .step-icon {
-                background: #22c55e;
-                color: white;
-            }
-            .workflow-step.current .step-icon {
-                background: var(--primary);
-                color: white;
-                animation: pulse 2s infinite;
-            }
-            @keyframes pulse {
-                0%, 100% { transform: scale(1); }
-                50% { transform: scale(1.05); }
-            }
-            .workflow-step .step-info h4 {
-                color: white;
-                font-size: 11px;
-                font-weight: 600;
-                margin: 0;
-            }
-            .workflow-step .step-info p {
-                color: var(--text-secondary);
-                font-size: 9px;
-                margin: 0;
-                display: none; /* 隐藏详细描述以节省空间 */
-            }
-            .workflow-step.current .step-info h4 {
-                color: var(--primary);
-            }
-            .workflow-step.completed .step-info h4 {
-                color: #22c55e;
-            }
-
-            /* ===== ComfyUI 连接状态 ===== */
-            .comfyui-status-container {
-                background: var(--card-dark);
-                border: 1px solid var(--border-dark);
-                border-radius: 8px;
-                padding: 8px 12px;
-                margin-bottom: 8px;
-            }
-            .comfyui-status {
-                font-size: 12px;
-                font-weight: 500;
-                padding: 4px 0;
-            }
-            .comfyui-status.connected {
-                color: #22c55e;
-            }
-            .comfyui-status.available {
-                color: #eab308;
-            }
-            .comfyui-status.disconnected {
-                color: #ef4444;
-            }
-            .comfyui-connect-btn {
-                margin-top: 6px;
-            }
-
-            /* ===== 生成控制栏样式 ===== */
-            .generate-control-bar {
-                background: var(--card-dark);
-                border: 1px solid var(--border-dark);
-                border-radius: 8px;
-                padding: 8px 12px;
-                margin: 8px 0;
-                align-items: center !important;
-                gap: 8px !important;
-            }
-            .generate-control-bar > div {
-                min-width: 0;
-            }
-            .shot-num-input {
-                max-width: 80px !important;
-            }
-            .shot-num-input input[type="number"] {
-                text-align: center;
-                font-size: 16px;
-                font-weight: bold;
-                padding: 8px !important;
-                background: var(--surface-dark) !important;
-                border: 2px solid var(--primary) !important;
-                border-radius: 6px !important;
-            }
-            /* 折叠面板样式优化 */
-            .gradio-accordion {
-                border: 1px solid var(--border-dark) !important;
-                border-radius: 8px !important;
-                margin-top: 8px !important;
-            }
-            .gradio-accordion > .label-wrap {
-                padding: 8px 12px !important;
-                background: var(--surface-dark) !important;
-            }
-            .gradio-accordion > .label-wrap span {
-                font-size: 13px !important;
-            }
-            .text-muted {
-                color: var(--text-secondary) !important;
-                font-size: 12px !important;
-                margin: 4px 0 8px 0 !important;
-            }
-
-            /* ===== 加载范例后的三栏布局 ===== */
-            /* 使用CSS Grid重构布局：左边范例(20%) | 中间工作区(60%) | 右边设置(20%) */
-
-            /* 父容器使用Grid布局 */
-            body.layout-active .gradio-container main .wrap .contain > .column {
-                display: grid !important;
-                grid-template-columns: 20% 60% 20%;
-                grid-template-rows: auto auto 1fr auto;
-                gap: 16px;
-                align-items: start;
-            }
-
-            /* 项目摘要卡片横跨全宽 */
-            body.layout-active .gradio-container main .wrap .contain > .column > .block:first-child {
-                grid-column: 1 / -1;
-                grid-row: 1;
-            }
-
-            /* 主布局行（包含范例和设置）分解为独立区域 */
-            body.layout-active .gradio-container main .wrap .contain > .column > .row {
-                display: contents !important;
-            }
-
-            /* 左侧范例区 - 第1列 */
-            body.layout-active .gradio-container main .wrap .contain > .column > .row > .column:first-child {
-                grid-column: 1;
-                grid-row: 2 / span 2;
-                max-height: 80vh;
-                overflow-y: auto;
-                overflow-x: hidden;
-                position: sticky;
-                top: 20px;
-                word-wrap: break-word;
-            }
-
-            /* 右侧设置区 - 第3列 */
-            body.layout-active .gradio-container main .wrap .contain > .column > .row > .column:last-child {
-                grid-column: 3;
-                grid-row: 2 / span 2;
-                max-height: 80vh;
-                overflow-y: auto;
-                overflow-x: hidden;
-                position: sticky;
-                top: 20px;
-                word-wrap: break-word;
-            }
-
-            /* 确保所有侧边栏内容不超宽 */
-            body.layout-active .gradio-container main .wrap .contain > .column > .row > .column:first-child *,
-            body.layout-active .gradio-container main .wrap .contain > .column > .row > .column:last-child * {
-                max-width: 100%;
-                box-sizing: border-box;
-            }
-
-            /* 侧边栏内元素纵向排列 */
-            body.layout-active .gradio-container main .wrap .contain > .column > .row > .column:first-child > .block,
-            body.layout-active .gradio-container main .wrap .contain > .column > .row > .column:last-child > .block {
-                width: 100%;
-                flex-shrink: 0;
-            }
-
-            /* 侧边栏内 Accordion 默认折叠样式 */
-            body.layout-active .gradio-container main .wrap .contain > .column > .row > .column .accordion {
-                width: 100%;
-            }
-            body.layout-active .gradio-container main .wrap .contain > .column > .row > .column .accordion > .label-wrap {
-                padding: 8px 12px;
-                font-size: 13px;
-            }
-            body.layout-active .gradio-container main .wrap .contain > .column > .row > .column .accordion > .label-wrap svg {
-                width: 14px;
-                height: 14px;
-            }
-
-            /* 侧边栏表格和数据框不超宽 */
-            body.layout-active .gradio-container main .wrap .contain > .column > .row > .column table {
-                width: 100%;
-                table-layout: fixed;
-            }
-            body.layout-active .gradio-container main .wrap .contain > .column > .row > .column table td,
-            body.layout-active .gradio-container main .wrap .contain > .column > .row > .column table th {
-                overflow: hidden;
-                text-overflow: ellipsis;
-                white-space: nowrap;
-                max-width: 150px;
-            }
-            body.layout-active .gradio-container main .wrap .contain > .column > .row > .column .dataframe {
-                overflow-x: hidden !important;
-            }
-
-            /* 侧边栏图片适应宽度 */
-            body.layout-active .gradio-container main .wrap .contain > .column > .row > .column img {
-                max-width: 100%;
-                height: auto;
-            }
-
-            /* 侧边栏输入框和按钮 */
-            body.layout-active .gradio-container main .wrap .contain > .column > .row > .column input,
-            body.layout-active .gradio-container main .wrap .contain > .column > .row > .column textarea,
-            body.layout-active .gradio-container main .wrap .contain > .column > .row > .column select {
-                width: 100%;
-                max-width: 100%;
-            }
-            body.layout-active .gradio-container main .wrap .contain > .column > .row > .column button {
-                white-space: normal;
-                word-wrap: break-word;
-            }
-
-            /* 侧边栏 Row 内元素堆叠 */
-            body.layout-active .gradio-container main .wrap .contain > .column > .row > .column .row {
-                flex-wrap: wrap;
-            }
-            body.layout-active .gradio-container main .wrap .contain > .column > .row > .column .row > * {
-                flex: 1 1 100%;
-                min-width: 0;
-            }
-
-            /* 工作流指示器 - 第2列顶部 */
-            body.layout-active .workflow-indicator {
-                grid-column: 2 !important;
-                grid-row: 2 !important;
-            }
-
-            /* 主标签页(工作区) - 第2列主体 */
-            body.layout-active .gradio-container main .wrap .contain > .column > .tabs {
-                grid-column: 2 !important;
-                grid-row: 3 !important;
-            }
-
-            /* 隐藏不需要的元素 */
-            body.layout-active .quick-start-banner {
-                display: none !important;
-            }
-            body.layout-active .workflow-guide {
-                display: none !important;
-            }
-            body.layout-active .workflow-nav-buttons {
-                display: none !important;
-            }
-
-            /* 隐藏的HTML块不占用网格空间 */
-            body.layout-active .gradio-container main .wrap .contain > .column > .block.hide-container:not(.workflow-indicator):not(:first-child) {
-                display: none !important;
-            }
-
-            /* 左侧列使用flexbox重排内容 */
-            body.layout-active .gradio-container main .wrap .contain > .column > .row > .column:first-child {
-                display: flex !important;
-                flex-direction: column !important;
-            }
-
-            /* 项目摘要卡片保持顶部 */
-            body.layout-active .project-summary-card {
-                order: 1 !important;
-            }
-
-            /* 范例模板区域移到底部并折叠 */
-            body.layout-active .templates-section {
-                order: 100 !important;
-                margin-top: auto !important;
-                padding-top: 16px !important;
-                border-top: 1px solid var(--border-dark) !important;
-            }
-            body.layout-active .templates-section h3 {
-                cursor: pointer;
-                display: flex;
-                align-items: center;
-                justify-content: space-between;
-                font-size: 13px !important;
-                margin-bottom: 0 !important;
-                padding: 8px 0;
-            }
-            body.layout-active .templates-section h3::after {
-                content: '▼';
-                font-size: 10px;
-                transition: transform 0.3s;
-            }
-            body.layout-active .templates-section.collapsed h3::after {
-                transform: rotate(-90deg);
-            }
-            body.layout-active .templates-section h3 span {
-                display: none !important;
-            }
-
-            /* 模板卡片容器 - 默认折叠 */
-            body.layout-active .gradio-container main .wrap .contain > .column > .row > .column:first-child > .row {
-                order: 101 !important;
-                max-height: 0;
-                overflow: hidden;
-                transition: max-height 0.3s ease, opacity 0.3s ease;
-                opacity: 0;
-            }
-            body.layout-active .gradio-container main .wrap .contain > .column > .row > .column:first-child > .row.templates-expanded {
-                max-height: 500px !important;
-                opacity: 1 !important;
-            }
-
-            /* 范例卡片紧凑显示 */
-            body.layout-active .template-card {
-                padding: 8px !important;
-                margin-bottom: 4px;
-            }
-            body.layout-active .template-card h4 {
-                font-size: 12px !important;
-                margin-bottom: 2px;
-            }
-            body.layout-active .template-card p {
-                display: none !important;
-            }
-            body.layout-active .template-card .meta {
-                font-size: 10px !important;
-            }
-            body.layout-active .template-card .badge {
-                font-size: 9px !important;
-                padding: 2px 6px !important;
-            }
-
-            /* 加载按钮紧凑 */
-            body.layout-active .gradio-container main .wrap .contain > .column > .row > .column:first-child > .row button {
-                font-size: 11px !important;
-                padding: 4px 8px !important;
-            }
-
-            /* 页脚横跨全宽 */
-            body.layout-active .gradio-container main .wrap .contain > .column > .block:last-child {
-                grid-column: 1 / -1;
-                grid-row: 4;
-            }
-
-            /* 响应式 - 平板 */
-            @media (max-width: 1200px) {
-                body.layout-active .gradio-container main .wrap .contain > .column {
-                    grid-template-columns: 25% 50% 25%;
-                }
-            }
-
-            /* 响应式 - 手机 */
-            @media (max-width: 768px) {
-                body.layout-active .gradio-container main .wrap .contain > .column {
-                    display: flex !important;
-                    flex-direction: column;
-                }
-                body.layout-active .gradio-container main .wrap .contain > .column > .row {
-                    display: flex !important;
-                    flex-direction: column;
-                }
-                body.layout-active .gradio-container main .wrap .contain > .column > .row > .column {
-                    max-height: none;
-                    position: static;
-                }
-            }
-        </style>
-        """)
+        # 工作流进度指示器样式见 static/app.css
 
         # ===== 隐藏的兼容组件 =====
         with gr.Row(visible=False):
@@ -6412,7 +4765,11 @@ def create_ui():
             smart_apply_btn = gr.Button("应用导入")
 
         # ===== 工作流进度指示器 =====
-        workflow_step_indicator = gr.HTML(value=get_workflow_indicator(0), elem_classes="workflow-indicator")
+        gr.HTML(value=get_workflow_indicator(0), elem_classes="workflow-indicator")
+
+        # 隐藏元素：当前步骤号，变化时由 WORKFLOW_INDICATOR_JS 更新指示器 (使用CSS隐藏以保持JavaScript可交互)
+        with gr.Row(elem_classes="hidden-trigger-row"):
+            workflow_step_indicator = gr.Number(value=0, precision=0, elem_id="workflow_step_value")
 
         with gr.Tabs() as main_tabs:
 
@@ -6502,6 +4859,8 @@ def create_ui():
                         char_list = gr.Dataframe(
                             headers=["名称", "描述", "参考图数"],
                             value=get_character_list(),
+                            column_widths=["25%", "55%", "20%"],
+                            elem_classes="project-table",
                             show_label=False,
                             interactive=False
                         )
@@ -6514,6 +4873,8 @@ def create_ui():
                         scene_list = gr.Dataframe(
                             headers=["名称", "描述"],
                             value=get_scene_list(),
+                            column_widths=["30%", "70%"],
+                            elem_classes="project-table",
                             show_label=False,
                             interactive=False
                         )
@@ -6528,13 +4889,15 @@ def create_ui():
                         ["2D", "3D"],
                         label="风格类型",
                         value="2D",
-                        scale=2
+                        scale=2,
+                        elem_classes="radio-pills"
                     )
                     style_lock = gr.Checkbox(label="🔒 锁定风格", value=True, scale=1)
                 style_choice = gr.Radio(
-                    ["2D卡通", "动漫风", "漫画风", "水彩画"],
+                    STYLE_OPTIONS["2D"],
                     label="详细风格",
-                    value="2D卡通"
+                    value="2D卡通",
+                    elem_classes="radio-pills"
                 )
                 style_btn = gr.Button("应用风格", elem_classes="secondary-btn")
                 style_status = gr.Textbox(label="", show_label=False, interactive=False, container=False)
@@ -6562,9 +4925,10 @@ def create_ui():
                 """)
 
                 shot_template = gr.Radio(
-                    ["全景", "中景", "特写", "过肩", "低角度", "跟随"],
+                    list(SHOT_TEMPLATE_MAP),
                     label="镜头类型",
-                    value="中景"
+                    value="中景",
+                    elem_classes="radio-pills"
                 )
 
                 with gr.Row():
@@ -6577,7 +4941,7 @@ def create_ui():
                     ai_shot_desc_btn = gr.Button("🤖 AI生成", elem_classes="secondary-btn", size="sm", scale=1)
 
                 with gr.Row():
-                    shot_chars = gr.CheckboxGroup(choices=[], label="出镜角色")
+                    shot_chars = gr.CheckboxGroup(choices=[], label="出镜角色", elem_classes="checkbox-pills")
                     shot_scene = gr.Dropdown(choices=[], label="场景")
 
                 with gr.Row():
@@ -6592,6 +4956,8 @@ def create_ui():
                 shot_list = gr.Dataframe(
                     headers=["#", "类型", "场景", "角色", "描述", "状态"],
                     value=get_shot_list(),
+                    column_widths=["6%", "12%", "14%", "18%", "38%", "12%"],
+                    elem_classes="project-table",
                     show_label=False,
                     interactive=False
                 )
@@ -6673,7 +5039,8 @@ def create_ui():
                 gr.Markdown("### 🎬 视频生成")
 
                 # 视频镜头预览卡片（样式与图片镜头一致）
-                video_cards_html = gr.HTML(value=get_video_cards_html(), elem_classes="video-cards-panel")
+                # 视频卡片和统计需要逐个检查视频文件，构建界面时留空，页面加载后再填充
+                video_cards_html = gr.HTML(value="", elem_classes="video-cards-panel")
 
                 # 按钮行
                 with gr.Row(elem_classes="video-generate-bar"):
@@ -6689,7 +5056,7 @@ def create_ui():
                     refresh_video_cards_btn = gr.Button("🔄 刷新", elem_classes="secondary-btn", scale=0, min_width=80)
 
                 # 统计信息
-                video_stats_html = gr.HTML(value=get_video_stats_html(), elem_classes="video-stats-panel")
+                video_stats_html = gr.HTML(value="", elem_classes="video-stats-panel")
 
                 # 状态显示（取消视频预览播放器，改用弹窗）
                 batch_video_status = gr.Textbox(label="生成状态", show_label=True, interactive=False, placeholder="就绪", lines=1)
@@ -6704,17 +5071,18 @@ def create_ui():
                     interactive=False,
                     placeholder="ComfyUI 生成过程将在此显示...",
                     lines=4,
-                    max_lines=8
+                    max_lines=8,
+                    autoscroll=True
                 )
 
                 # 隐藏元素：用于单个镜头视频生成触发 (使用CSS隐藏以保持JavaScript可交互)
                 with gr.Row(elem_classes="hidden-trigger-row"):
-                    single_video_shot_num = gr.Number(value=1, elem_id="single_video_shot_num")
+                    single_video_shot_num = gr.Textbox(value="1", elem_id="single_video_shot_num")
                     single_video_trigger_btn = gr.Button("生成单个视频", elem_id="single_video_trigger_btn")
 
                 # 隐藏元素：用于视频预览触发
                 with gr.Row(elem_classes="hidden-trigger-row"):
-                    preview_video_shot_num = gr.Number(value=1, elem_id="preview_video_shot_num")
+                    preview_video_shot_num = gr.Textbox(value="1", elem_id="preview_video_shot_num")
                     preview_video_trigger_btn = gr.Button("预览视频", elem_id="preview_video_trigger_btn")
 
                 # ===== 折叠区域：一致性设置 =====
@@ -6748,28 +5116,32 @@ def create_ui():
                                 ["图生视频", "文生视频"],
                                 label="生成模式",
                                 value="图生视频",
-                                info="图生视频：基于已生成的分镜图片；文生视频：直接从描述生成"
+                                info="图生视频：基于已生成的分镜图片；文生视频：直接从描述生成",
+                                elem_classes="radio-pills"
                             )
 
                             # 视频风格
                             video_style = gr.Radio(
                                 ["电影感", "动漫风", "写实风", "赛博朋克"],
                                 label="视频风格",
-                                value="电影感"
+                                value="电影感",
+                                elem_classes="radio-pills"
                             )
 
                             # 视频时长
                             video_duration = gr.Radio(
                                 ["3秒", "5秒", "10秒"],
                                 label="视频时长",
-                                value="5秒"
+                                value="5秒",
+                                elem_classes="radio-pills"
                             )
 
                             # 运镜方式
                             video_camera = gr.Radio(
                                 ["静止", "缓慢推进", "缓慢拉远", "左右平移", "跟随主体"],
                                 label="运镜方式",
-                                value="静止"
+                                value="静止",
+                                elem_classes="radio-pills"
                             )
 
                         # 右侧：一致性参考图
@@ -6849,7 +5221,8 @@ def create_ui():
                 export_format = gr.Radio(
                     ["图片包 (ZIP)", "项目文件 (JSON)", "分镜脚本 (TXT)", "完整备份 (ZIP+JSON+图片)"],
                     label="导出格式",
-                    value="图片包 (ZIP)"
+                    value="图片包 (ZIP)",
+                    elem_classes="radio-pills"
                 )
 
                 export_btn = gr.Button("导出", elem_classes="primary-btn")
@@ -6891,22 +5264,9 @@ def create_ui():
         # 事件绑定
         # ========================================
 
-        # API 配置保存
-        llm_save_btn.click(
-            save_llm_config,
-            inputs=[llm_provider_cn, llm_api_key_cn, llm_api_url_cn, llm_provider_intl, llm_api_key_intl, llm_api_url_intl],
-            outputs=[llm_save_status]
-        )
-
-        img_save_btn.click(
-            save_image_config,
-            inputs=[img_provider_cn, img_api_key_cn, img_api_url_cn, img_provider_intl, img_api_key_intl, img_api_url_intl],
-            outputs=[img_save_status]
-        )
-
         # ComfyUI 连接状态
-        def refresh_comfyui_status():
-            status_html, _ = get_comfyui_status()
+        async def refresh_comfyui_status():
+            status_html, _ = await get_comfyui_status_async()
             return status_html
 
         comfyui_refresh_btn.click(
@@ -6923,34 +5283,6 @@ def create_ui():
             outputs=[comfyui_msg]
         )
 
-        # ComfyUI 工作流加载
-        load_default_workflow_btn.click(
-            load_default_workflow,
-            outputs=[workflow_status]
-        )
-
-        # 点击自定义按钮显示文件上传
-        load_custom_workflow_btn.click(
-            lambda: gr.update(visible=True),
-            outputs=[img_workflow_file]
-        )
-
-        # 上传文件后加载工作流
-        img_workflow_file.change(
-            load_workflow_from_file,
-            inputs=[img_workflow_file],
-            outputs=[workflow_status]
-        ).then(
-            lambda: gr.update(visible=False),
-            outputs=[img_workflow_file]
-        )
-
-        video_save_btn.click(
-            save_video_config,
-            inputs=[video_provider_cn, video_api_key_cn, video_api_url_cn, video_provider_intl, video_api_key_intl, video_api_url_intl],
-            outputs=[video_save_status]
-        )
-
         # 创建项目
         create_btn.click(
             create_project,
@@ -6982,53 +5314,19 @@ def create_ui():
             outputs=[smart_import_status, project_summary, char_list, scene_list, shot_list]
         )
 
-        # 加载范例 (使用与模板按钮相同的输出列表)
-        load_example_btn.click(
-            load_example_story,
-            inputs=[example_choice],
-            outputs=[
-                example_status, project_summary, example_desc,
-                char_list, scene_list, shot_list,
-                del_char_name, del_scene_name,
-                shot_chars, shot_scene,
-                style_choice, standard_prompt, generated_prompt,
-                workflow_step_indicator,
-                step2_summary, step3_summary, step4_summary,
-                shot_cards_html
-            ]
-        ).then(
-            lambda: (get_video_cards_html(), get_video_stats_html()),
-            outputs=[video_cards_html, video_stats_html]
-        )
-
         # ========================================
         # 首页导航按钮事件绑定
         # ========================================
 
-        # 工作流导航按钮 - 点击跳转到对应标签页
-        nav_create_btn.click(
-            fn=None,
-            js="() => { const tabs = document.querySelectorAll('[role=\"tablist\"] button'); if(tabs[0]) tabs[0].click(); }"
-        )
-        nav_arrange_btn.click(
-            fn=None,
-            js="() => { const tabs = document.querySelectorAll('[role=\"tablist\"] button'); if(tabs[1]) tabs[1].click(); }"
-        )
-        nav_generate_btn.click(
-            fn=None,
-            js="() => { const tabs = document.querySelectorAll('[role=\"tablist\"] button'); if(tabs[2]) tabs[2].click(); }"
-        )
-        nav_export_btn.click(
+        # 工作流导航按钮由页面加载脚本中的全局点击委托处理（data-nav-tab）
+
+        # 工作流进度指示器：步骤号变化时只在前端切换样式
+        workflow_step_indicator.change(
             fn=None,
-            js="() => { const tabs = document.querySelectorAll('[role=\"tablist\"] button'); if(tabs[3]) tabs[3].click(); }"
+            inputs=[workflow_step_indicator],
+            js=WORKFLOW_INDICATOR_JS
         )
 
-        # 快速开始模板按钮 - 加载预设范例
-        def load_template_and_navigate(template_name):
-            """加载模板并返回状态"""
-            result = load_example_story(template_name)
-            return result
-
         # 模板加载按钮 - 更新所有相关 UI 元素
         template_outputs = [
             example_status, project_summary, example_desc,
@@ -7092,35 +5390,18 @@ def create_ui():
             js=load_example_js.replace('{id}', 'ai-generated')
         )
 
-        load_madao_btn.click(
-            lambda: load_example_story("马到成功送祝福"),
-            outputs=template_outputs
-        ).then(
-            lambda: (get_video_cards_html(), get_video_stats_html()),
-            outputs=[video_cards_html, video_stats_html]
-        ).then(
-            fn=None,
-            js=load_example_js.replace('{id}', 'madao')
-        )
-        load_junma_btn.click(
-            lambda: load_example_story("骏马奔腾迎新年"),
-            outputs=template_outputs
-        ).then(
-            lambda: (get_video_cards_html(), get_video_stats_html()),
-            outputs=[video_cards_html, video_stats_html]
-        ).then(
-            fn=None,
-            js=load_example_js.replace('{id}', 'junma')
-        )
-        load_mashang_btn.click(
-            lambda: load_example_story("马上有美食"),
+        # 范例卡片点击（data-template）由全局委托写入 template_action_key 后触发此按钮
+        template_action_btn.click(
+            lambda key: load_example_story(TEMPLATE_STORY_NAMES.get(key, "")),
+            inputs=[template_action_key],
             outputs=template_outputs
         ).then(
             lambda: (get_video_cards_html(), get_video_stats_html()),
             outputs=[video_cards_html, video_stats_html]
         ).then(
             fn=None,
-            js=load_example_js.replace('{id}', 'mashang')
+            inputs=[template_action_key],
+            js=load_example_js.replace("() => {", "(templateKey) => {", 1).replace("'template-{id}'", "'template-' + templateKey")
         )
 
         # 英雄区按钮
@@ -7133,9 +5414,30 @@ def create_ui():
             js="() => { document.querySelector('.templates-section')?.scrollIntoView({behavior: 'smooth'}); }"
         )
 
-        # 添加角色
+        # 添加角色/场景/镜头：列表、下拉选项和项目摘要在同一次事件中返回，避免再链式 .then 刷新
+        def add_character_and_refresh(*args):
+            status, char_rows = add_character_with_multi_images(*args)
+            char_names = get_character_names()
+            return (
+                status, char_rows,
+                gr.update(choices=char_names), gr.update(choices=char_names),
+                get_project_summary()
+            )
+
+        def add_scene_and_refresh(*args):
+            status, scene_rows = add_scene_with_multi_images(*args)
+            scene_names = get_scene_names()
+            return (
+                status, scene_rows,
+                gr.update(choices=scene_names), gr.update(choices=scene_names),
+                get_project_summary()
+            )
+
+        def add_shot_and_refresh(*args):
+            return (*add_shot_simple(*args), get_project_summary())
+
         add_char_btn.click(
-            add_character_with_multi_images,
+            add_character_and_refresh,
             inputs=[
                 char_name, char_desc, char_images,
                 char_gender, char_age, char_ethnicity,
@@ -7147,20 +5449,14 @@ def create_ui():
                 char_bottom, char_bottom_color,
                 char_outerwear, char_accessories
             ],
-            outputs=[char_status, char_list]
-        ).then(
-            lambda: get_project_summary(),
-            outputs=[project_summary]
+            outputs=[char_status, char_list, shot_chars, del_char_name, project_summary]
         )
 
         # 添加场景
         add_scene_btn.click(
-            add_scene_with_multi_images,
+            add_scene_and_refresh,
             inputs=[scene_name, scene_desc, scene_images],
-            outputs=[scene_status, scene_list]
-        ).then(
-            lambda: get_project_summary(),
-            outputs=[project_summary]
+            outputs=[scene_status, scene_list, shot_scene, del_scene_name, project_summary]
         )
 
         # ========================================
@@ -7201,15 +5497,17 @@ def create_ui():
             outputs=[ai_project_summary]
         )
 
-        # CLI 输出刷新和清空
+        # CLI 输出刷新和清空（只读内存中的日志，不经过队列）
         refresh_cli_btn.click(
             get_cli_output,
-            outputs=[cli_output_display]
+            outputs=[cli_output_display],
+            queue=False
         )
 
         clear_cli_btn.click(
             clear_cli_output,
-            outputs=[cli_output_display]
+            outputs=[cli_output_display],
+            queue=False
         )
 
         # 设置风格
@@ -7219,18 +5517,20 @@ def create_ui():
             outputs=[style_status]
         )
 
-        # 风格类型切换 (2D/3D)
+        # 风格类型切换 (2D/3D)：纯界面切换，不进入队列
         style_category.change(
             get_style_options,
             inputs=[style_category],
-            outputs=[style_choice]
+            outputs=[style_choice],
+            queue=False
         )
 
         # 风格锁定切换
         style_lock.change(
             toggle_style_lock,
             inputs=[style_lock],
-            outputs=[style_lock_info]
+            outputs=[style_lock_info],
+            queue=False
         )
 
         # 刷新下拉
@@ -7241,12 +5541,9 @@ def create_ui():
 
         # 添加镜头
         add_shot_btn.click(
-            add_shot_simple,
+            add_shot_and_refresh,
             inputs=[shot_template, shot_desc, shot_chars, shot_scene],
-            outputs=[shot_status, shot_list, generated_prompt, standard_prompt]
-        ).then(
-            lambda: get_project_summary(),
-            outputs=[project_summary]
+            outputs=[shot_status, shot_list, generated_prompt, standard_prompt, project_summary]
         )
 
         # 查看镜头提示语
@@ -7304,7 +5601,9 @@ def create_ui():
         gen_single_btn.click(
             generate_single_shot,
             inputs=[gen_shot_num, generated_prompt],
-            outputs=[gen_status, preview_image]
+            outputs=[gen_status, preview_image],
+            concurrency_id=COMFYUI_CONCURRENCY_ID,
+            concurrency_limit=COMFYUI_CONCURRENCY_LIMIT
         ).then(
             lambda: (get_project_summary(), get_shot_list(), get_shot_cards_html()),
             outputs=[project_summary, shot_list, shot_cards_html]
@@ -7313,7 +5612,9 @@ def create_ui():
         # 生成全部
         gen_all_btn.click(
             generate_all_shots,
-            outputs=[gen_status]
+            outputs=[gen_status],
+            concurrency_id=COMFYUI_CONCURRENCY_ID,
+            concurrency_limit=COMFYUI_CONCURRENCY_LIMIT
         ).then(
             lambda: (get_project_summary(), get_shot_list(), get_shot_cards_html()),
             outputs=[project_summary, shot_list, shot_cards_html]
@@ -7344,7 +5645,9 @@ def create_ui():
                 video_duration, video_camera,
                 video_char_ref, video_prop_ref, video_scene_ref
             ],
-            outputs=[video_gen_status, video_preview]
+            outputs=[video_gen_status, video_preview],
+            concurrency_id=COMFYUI_CONCURRENCY_ID,
+            concurrency_limit=COMFYUI_CONCURRENCY_LIMIT
         )
 
         # 批量生成全部视频
@@ -7355,15 +5658,24 @@ def create_ui():
                 video_duration, video_camera,
                 video_char_ref, video_prop_ref, video_scene_ref
             ],
-            outputs=[video_gen_status, video_gallery]
+            outputs=[video_gen_status, video_gallery],
+            concurrency_id=COMFYUI_CONCURRENCY_ID,
+            concurrency_limit=COMFYUI_CONCURRENCY_LIMIT
         )
 
         # 刷新视频画廊
         refresh_video_gallery_btn.click(
-            lambda: [],  # TODO: 实现获取已生成视频列表
+            get_video_gallery_items,
             outputs=[video_gallery]
         )
 
+        # 画廊放大预览：选中项切换为原图，网格其余条目仍用缩略图
+        video_gallery.select(
+            select_video_gallery_item,
+            outputs=[video_gallery],
+            queue=False
+        )
+
         # 一键生成全部视频（主按钮）
         batch_video_btn.click(
             generate_all_videos_with_cli,
@@ -7372,7 +5684,9 @@ def create_ui():
                 video_duration, video_camera,
                 video_char_ref, video_prop_ref, video_scene_ref
             ],
-            outputs=[batch_video_status, video_cli_output, video_gallery]
+            outputs=[batch_video_status, video_cli_output, video_gallery],
+            concurrency_id=COMFYUI_CONCURRENCY_ID,
+            concurrency_limit=COMFYUI_CONCURRENCY_LIMIT
         ).then(
             lambda: (get_video_cards_html(), get_video_stats_html()),
             outputs=[video_cards_html, video_stats_html]
@@ -7443,7 +5757,15 @@ def create_ui():
         single_video_trigger_btn.click(
             generate_single_video_with_cli,
             inputs=[single_video_shot_num],
-            outputs=[batch_video_status, video_cli_output, video_cards_html, video_stats_html]
+            outputs=[batch_video_status, video_cli_output, video_cards_html, video_stats_html, single_video_shot_num],
+            concurrency_id=COMFYUI_CONCURRENCY_ID,
+            concurrency_limit=COMFYUI_CONCURRENCY_LIMIT,
+            # 生成中再点其他镜头时不丢弃触发，由 ComfyUI 并发组在服务端排队
+            trigger_mode="multiple"
+        ).then(
+            fn=None,
+            inputs=[single_video_shot_num],
+            js=SHOT_VIDEO_DONE_JS
         )
 
         # 导出
@@ -7455,8 +5777,8 @@ def create_ui():
 
         # ========================================
         # 页面加载时检测 ComfyUI 状态
-        def on_page_load():
-            status_html, _ = get_comfyui_status()
+        async def on_page_load():
+            status_html, _ = await get_comfyui_status_async()
             return status_html
 
         # 镜头预览弹窗初始化 JavaScript
@@ -7467,14 +5789,64 @@ def create_ui():
             window.globalShotsData = [];
             window.globalCurrentIndex = 0;
 
+            // 弹窗首次打开时才创建 DOM
+            window._globalModalTemplates = __MODAL_TEMPLATES__;
+            window.ensureGlobalModal = function(id) {
+                var modal = document.getElementById(id);
+                if (!modal && window._globalModalTemplates[id]) {
+                    var tpl = document.createElement('template');
+                    tpl.innerHTML = window._globalModalTemplates[id].trim();
+                    modal = tpl.content.firstElementChild;
+                    document.body.appendChild(modal);
+                }
+                return modal;
+            };
+
+            // 首页导航按钮和范例卡片共用一个委托监听
+            window.loadTemplateByKey = function(key) {
+                var keyInput = document.querySelector('#template_action_key textarea, #template_action_key input');
+                if (keyInput) {
+                    keyInput.value = key;
+                    keyInput.dispatchEvent(new Event('input', { bubbles: true }));
+                }
+                setTimeout(function() {
+                    var triggerBtn = document.querySelector('#template_action_btn');
+                    if (triggerBtn) triggerBtn.click();
+                }, 150);
+            };
+
             document.addEventListener('click', function(e) {
+                var navBtn = e.target.closest('[data-nav-tab]');
+                if (navBtn) {
+                    var tabs = document.querySelectorAll('[role="tablist"] button');
+                    var tab = tabs[parseInt(navBtn.getAttribute('data-nav-tab'))];
+                    if (tab) tab.click();
+                    return;
+                }
+                var templateCard = e.target.closest('[data-template]');
+                if (templateCard) {
+                    window.loadTemplateByKey(templateCard.getAttribute('data-template'));
+                    return;
+                }
+                /* 镜头卡片上的生成视频按钮，需在镜头卡片预览之前处理 */
+                var videoBtn = e.target.closest('.shot-video-btn');
+                if (videoBtn) {
+                    if (window.generateShotVideo) window.generateShotVideo(parseInt(videoBtn.getAttribute('data-shot-num')));
+                    return;
+                }
+                var videoCard = e.target.closest('.video-card[data-has-video]');
+                if (videoCard) {
+                    if (window.previewVideoByShot) window.previewVideoByShot(parseInt(videoCard.getAttribute('data-shot-num')));
+                    return;
+                }
+
                 var card = e.target.closest('.shot-card');
                 if (card) {
                     var shotNum = parseInt(card.getAttribute('data-shot-num'));
                     console.log('[镜头预览] 点击镜头卡片:', shotNum, '数据长度:', window.globalShotsData.length);
                     if (shotNum) {
                         window.globalCurrentIndex = shotNum - 1;
-                        var modal = document.getElementById('globalShotModal');
+                        var modal = window.ensureGlobalModal('globalShotModal');
                         if (modal) {
                             if (window.globalShotsData.length >= shotNum) {
                                 window.updateGlobalModal();
@@ -7503,7 +5875,8 @@ def create_ui():
             });
 
             window.closeGlobalModal = function() {
-                document.getElementById('globalShotModal').style.display = 'none';
+                var modal = document.getElementById('globalShotModal');
+                if (modal) modal.style.display = 'none';
                 document.body.style.overflow = '';
             };
 
@@ -7530,12 +5903,35 @@ def create_ui():
                 document.getElementById('globalModalNav').textContent = (window.globalCurrentIndex + 1) + ' / ' + window.globalShotsData.length;
                 var imgArea = document.getElementById('globalModalImage');
                 if (shot.has_image && shot.img_uri) {
-                    imgArea.innerHTML = '<img src="' + shot.img_uri + '" class="modal-preview-img" />';
+                    var srcsetAttr = shot.img_srcset ? ' srcset="' + shot.img_srcset + '" sizes="(max-width: 768px) 100vw, 600px"' : '';
+                    imgArea.innerHTML = '<img src="' + shot.img_uri + '"' + srcsetAttr + ' class="modal-preview-img" decoding="async" />';
                 } else {
                     imgArea.innerHTML = '<div class="modal-no-image">🖼️<br/>图片待生成</div>';
                 }
             };
 
+            // 卡片分页：哨兵元素接近视口时把下一页 <template> 的卡片插入网格
+            window.mountCardPages = function() {
+                document.querySelectorAll('.cards-sentinel:not([data-observed])').forEach(function(sentinel) {
+                    sentinel.setAttribute('data-observed', 'true');
+                    var observer = new IntersectionObserver(function(entries) {
+                        if (!entries[0].isIntersecting) return;
+                        var page = sentinel.parentNode && sentinel.parentNode.querySelector(':scope > template.cards-page');
+                        if (!page) {
+                            observer.disconnect();
+                            sentinel.remove();
+                            return;
+                        }
+                        page.replaceWith(page.content);
+                        // 重新观察：若哨兵仍在视口附近会立即再挂载下一页
+                        observer.unobserve(sentinel);
+                        observer.observe(sentinel);
+                    }, { rootMargin: '600px 0px' });
+                    observer.observe(sentinel);
+                });
+            };
+            window.mountCardPages();
+
             window.updateShotsData = function(data) {
                 console.log('[镜头预览] 更新数据，共', data.length, '个镜头');
                 window.globalShotsData = data;
@@ -7545,12 +5941,22 @@ def create_ui():
         }
         """
 
+        shot_modal_init_js = shot_modal_init_js.replace(
+            "__MODAL_TEMPLATES__", json.dumps(GLOBAL_MODAL_TEMPLATES)
+        )
+
         demo.load(
             on_page_load,
             outputs=[comfyui_status_html],
             js=shot_modal_init_js
         )
 
+        # 视频卡片和统计单独加载，不等待 ComfyUI 探测
+        demo.load(
+            lambda: (get_video_cards_html(), get_video_stats_html()),
+            outputs=[video_cards_html, video_stats_html]
+        )
+
     return demo
 
 
@@ -7587,16 +5993,20 @@ if __name__ == "__main__":
         print("\nSome features may not work. Run 'python setup_wizard.py' to configure.")
         print("Continuing startup...\n")
 
+    from starlette.middleware import Middleware
+    from starlette.middleware.gzip import GZipMiddleware
+
     # 设置静态文件路径（Gradio 6.x文件服务）
     static_paths = [
         str(OUTPUTS_DIR),
         str(ASSETS_DIR),
         str(BASE_DIR / "projects"),
+        str(STATIC_DIR),
     ]
     gr.set_static_paths(paths=static_paths)
 
-    # 自动连接 ComfyUI
-    auto_connect_comfyui()
+    # 自动连接 ComfyUI（后台线程探测，不阻塞界面构建和服务启动）
+    threading.Thread(target=auto_connect_comfyui, daemon=True).start()
 
     demo = create_ui()
 
@@ -7605,6 +6015,7 @@ if __name__ == "__main__":
         str(OUTPUTS_DIR),
         str(ASSETS_DIR),
         str(BASE_DIR / "projects"),
+        str(STATIC_DIR),
     ]
 
     demo.launch(
@@ -7612,6 +6023,8 @@ if __name__ == "__main__":
         server_port=settings.gradio_port,
         share=False,
         inbrowser=True,
-        css=CUSTOM_CSS,
-        allowed_paths=allowed_paths
+        head=APP_CSS_HEAD,
+        allowed_paths=allowed_paths,
+        # 对页面、样式表和 JSON 响应启用 gzip 压缩（SSE 流不受影响）
+        app_kwargs={"middleware": [Middleware(GZipMiddleware, minimum_size=500)]}
     )
@@ -240,6 +240,8 @@ class ComfyUIClient:
         self._workflow_cache: Dict[str, Dict] = {}  # Cache loaded workflows
         self._available_models: Optional[List[str]] = None
         self._default_model: Optional[str] = None
+        # Reuse one HTTP connection pool for all REST calls to the server
+        self.session = requests.Session()
 
         # Auto-load workflow file if configured
         if self.config.workflow_file:
@@ -355,7 +357,7 @@ class ComfyUIClient:
         Returns: (success, message)
         """
         try:
-            response = requests.get(
+            response = self.session.get(
                 f"{self.config.base_url}/system_stats",
                 timeout=5
             )
@@ -372,7 +374,7 @@ class ComfyUIClient:
     def get_models(self) -> List[str]:
         """Get available checkpoint models"""
         try:
-            response = requests.get(
+            response = self.session.get(
                 f"{self.config.base_url}/object_info/CheckpointLoaderSimple",
                 timeout=10
             )
@@ -400,7 +402,7 @@ class ComfyUIClient:
                 if subfolder:
                     data['subfolder'] = subfolder
 
-                response = requests.post(
+                response = self.session.post(
                     f"{self.config.base_url}/upload/image",
                     files=files,
                     data=data,
@@ -489,7 +491,7 @@ class ComfyUIClient:
                 "client_id": self.client_id
             }
 
-            response = requests.post(
+            response = self.session.post(
                 f"{self.config.base_url}/prompt",
                 json=payload,
                 timeout=30
@@ -620,7 +622,7 @@ class ComfyUIClient:
                 "subfolder": subfolder,
                 "type": folder_type
             }
-            response = requests.get(
+            response = self.session.get(
                 f"{self.config.base_url}/view",
                 params=params,
                 timeout=30
@@ -822,7 +824,7 @@ class ComfyUIClient:
     def interrupt(self) -> bool:
         """Interrupt current generation"""
         try:
-            response = requests.post(
+            response = self.session.post(
                 f"{self.config.base_url}/interrupt",
                 timeout=5
             )
@@ -833,7 +835,7 @@ class ComfyUIClient:
     def get_queue_status(self) -> Dict:
         """Get current queue status"""
         try:
-            response = requests.get(
+            response = self.session.get(
                 f"{self.config.base_url}/queue",
                 timeout=5
             )
@@ -0,0 +1,73 @@
+"""
+批量视频生成测试
+
+运行: cd web && python -m pytest -q tests
+"""
+
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import gradio as gr
+
+import app
+from models import Shot, StoryboardProject
+
+
+def _setup_project(monkeypatch, with_images: bool):
+    """构造已连接 ComfyUI 的项目，并记录每个镜头的视频生成调用"""
+    shots = [
+        Shot(shot_number=n, output_image=f"/tmp/shot_{n}.png" if with_images else "")
+        for n in range(1, 4)
+    ]
+    monkeypatch.setattr(app, "current_project", StoryboardProject(name="测试", shots=shots))
+    monkeypatch.setattr(app, "get_ai_service", lambda: SimpleNamespace(comfyui_client=object()))
+    monkeypatch.setattr(app, "get_video_gallery_items", lambda: [])
+
+    calls = []
+
+    def fake_generate(shot_num, *args):
+        calls.append(shot_num)
+        return "✓ 视频生成完成", f"/tmp/shot_{shot_num}.mp4"
+
+    monkeypatch.setattr(app, "generate_video_from_shot", fake_generate)
+    return calls
+
+
+def test_image_to_video_generates_every_shot(monkeypatch):
+    """图生视频模式下图片齐全时，每个镜头都会生成视频"""
+    calls = _setup_project(monkeypatch, with_images=True)
+
+    results = list(app.generate_all_videos("图生视频", "电影感", "5秒", "静止", None, None, None))
+
+    assert calls == [1, 2, 3]
+    # 参数头 + 每个镜头一次 + 最终汇总
+    assert len(results) == 5
+    assert "成功: 3 个" in results[-1][0]
+    # 进度推送不清空画廊，只有最终结果更新画廊
+    assert all(gallery == gr.update() for _, gallery in results[:-1])
+    assert results[-1][1] == []
+
+
+def test_image_to_video_stops_when_images_missing(monkeypatch):
+    """图生视频模式下缺少图片时直接提示，不提交任何任务"""
+    calls = _setup_project(monkeypatch, with_images=False)
+
+    results = list(app.generate_all_videos("图生视频", "电影感", "5秒", "静止", None, None, None))
+
+    assert calls == []
+    assert len(results) == 1
+    assert "还没有生成图片" in results[0][0]
+
+
+def test_cli_wrapper_streams_shot_progress(monkeypatch):
+    """带 CLI 输出的批量生成在图生视频模式下逐个镜头推送并给出完成状态"""
+    calls = _setup_project(monkeypatch, with_images=True)
+
+    results = list(app.generate_all_videos_with_cli("图生视频", "电影感", "5秒", "静止", None, None, None))
+
+    assert calls == [1, 2, 3]
+    assert results[-1][0] != "就绪"
+    assert "批量生成完成" in results[-1][1]